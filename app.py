@@ -1,20 +1,26 @@
 import sys
-from datetime import datetime, date
-from typing import Optional, Callable
+from datetime import datetime, date, timedelta
+from typing import Dict, Optional, Callable
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QStackedWidget, QFrame, QProgressBar, 
     QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QFormLayout, 
     QLineEdit, QComboBox, QSpinBox, QMessageBox, QGroupBox, QGridLayout,
-    QCheckBox, QMenu, QDoubleSpinBox, QTimeEdit, QScrollArea, QTabWidget
+    QCheckBox, QMenu, QDoubleSpinBox, QTimeEdit, QScrollArea, QTabWidget,
+    QTableView, QStyledItemDelegate
+)
+from PyQt6.QtCore import (
+    Qt, QTimer, QPoint, QTime, QRect, QEvent, QAbstractTableModel, QModelIndex, pyqtSignal
 )
-from PyQt6.QtCore import Qt, QTimer, QPoint, QTime
 from PyQt6.QtGui import QFont, QColor, QAction
 
 import storage
 import logic
-from models import AppState, TaskTemplate, BookProject
+import perf
+from daemon import DaemonClient, RemoteSaver
+from saver import BackgroundSaver
+from models import AppState, TaskTemplate, BookProject, now_ts
 
 # --- Stylesheet ---
 DARK_STYLESHEET = """
@@ -28,7 +34,7 @@ QPushButton.ActionButton { background-color: #007acc; color: white; border: none
 QPushButton.ActionButton:hover { background-color: #0098ff; }
 QPushButton.StartButton { background-color: #2da44e; color: white; border-radius: 4px; font-weight: bold; padding: 6px; }
 QPushButton.StopButton { background-color: #d73a49; color: white; border-radius: 4px; font-weight: bold; padding: 6px; }
-QTableWidget { background-color: #1e1e1e; gridline-color: #333333; border: 1px solid #333333; }
+QTableWidget, QTableView { background-color: #1e1e1e; gridline-color: #333333; border: 1px solid #333333; }
 QHeaderView::section { background-color: #252526; padding: 4px; border: 1px solid #333333; font-weight: bold; }
 QGroupBox { border: 1px solid #454545; border-radius: 6px; margin-top: 20px; font-weight: bold; }
 QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 3px; color: #007acc; }
@@ -39,9 +45,10 @@ QScrollArea { border: none; background-color: transparent; }
 """
 
 class ProfileEditDialog(QDialog):
-    def __init__(self, state: AppState, parent=None):
+    def __init__(self, state: AppState, saver: BackgroundSaver, parent=None):
         super().__init__(parent)
         self.state = state
+        self.saver = saver
         self.setWindowTitle("Edit Profile & Skills")
         self.resize(500, 600)
         self.setStyleSheet("background-color: #252526;")
@@ -136,9 +143,10 @@ class ProfileEditDialog(QDialog):
             self.skills_table.setCellWidget(row, 1, spin)
 
     def save_all(self):
+        batch = logic.Batch()
         # 1. Save General
-        logic.update_profile_general(
-            self.state,
+        batch.add(
+            logic.update_profile_general,
             self.edit_username.text(),
             self.spin_xp.value(),
             self.spin_streak.value(),
@@ -150,8 +158,9 @@ class ProfileEditDialog(QDialog):
             spin = self.skills_table.cellWidget(row, 1)
             stat_name = spin.property("stat_name")
             new_level = spin.value()
-            logic.update_stat_level(self.state, stat_name, new_level)
+            batch.add(logic.update_stat_level, stat_name, new_level)
             
+        self.saver.mutate(logic.apply_batch, batch.operations)
         self.accept()
 
 class TaskDialog(QDialog):
@@ -335,6 +344,16 @@ class DashboardPage(QWidget):
             if col > 1: col = 0; row += 1
         stats_group.setLayout(stats_layout)
         main_layout.addWidget(stats_group)
+
+        wallet_group = QGroupBox("Wallet")
+        wallet_layout = QVBoxLayout()
+        self.lbl_balance = QLabel()
+        self.income_bar = QProgressBar()
+        self.income_bar.setTextVisible(True)
+        wallet_layout.addWidget(self.lbl_balance)
+        wallet_layout.addWidget(self.income_bar)
+        wallet_group.setLayout(wallet_layout)
+        main_layout.addWidget(wallet_group)
         main_layout.addStretch()
 
     def refresh(self):
@@ -351,26 +370,220 @@ class DashboardPage(QWidget):
                 pct = int(stat_obj.progress_to_next_level() * 100)
                 widgets["prog_bar"].setValue(pct)
 
-    def update_active_task_label(self):
-        active_sessions = logic.get_all_active_sessions(self.state)
-        if not active_sessions:
+        income, target = logic.get_income_progress(self.state, date.today())
+        self.lbl_balance.setText(f"Balance: {self.state.wallet.balance:.2f} TL")
+        self.income_bar.setRange(0, max(1, int(target)))
+        self.income_bar.setValue(max(0, min(int(income), int(target))))
+        self.income_bar.setFormat(f"This month: {income:.2f} / {target:.0f} TL")
+
+    def update_active_task_label(self, running: Dict[str, int]):
+        """running: task_id -> start timestamp, as cached by MainWindow."""
+        if not running:
             self.lbl_active_task.setText("")
             return
-        sess = active_sessions[0]
-        task = self.state.tasks.get(sess.task_id)
+        task_id, start = next(iter(running.items()))
+        task = self.state.tasks.get(task_id)
         if not task: return
-        start_dt = datetime.fromisoformat(sess.start_time)
-        duration = datetime.now() - start_dt
-        total_seconds = int(duration.total_seconds())
-        m, s = divmod(total_seconds, 60)
-        h, m = divmod(m, 60)
-        self.lbl_active_task.setText(f"⏱️ Active: {task.title} — {h:02d}:{m:02d}:{s:02d}")
+        self.lbl_active_task.setText(f"⏱️ Active: {task.title} — {format_hms(now_ts() - start)}")
+
+# --- Task Table Model ---
+
+TASK_ID_ROLE = Qt.ItemDataRole.UserRole
+VALUE_ROLE = Qt.ItemDataRole.UserRole + 1
+
+TASK_COLUMNS = {
+    "title": "Title", "cat": "Cat", "recur": "Recur", "target": "Target", "progress": "Progress",
+    "xp": "XP", "stat": "Stat", "time": "Active Time", "total": "Total Time", "action": "Action",
+}
+
+def format_hms(seconds: int) -> str:
+    m, s = divmod(max(0, seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+class TaskTableModel(QAbstractTableModel):
+    """Rows are task ids for one day; cells are read from the state on paint.
+
+    Nothing is cached per row, so a mutation only has to say which rows
+    changed (task_changed/remove_task/insert_task) and the view repaints them.
+    Running timers come from `running` (task_id -> start), set by the page.
+    """
+
+    def __init__(self, state: AppState, columns, parent=None):
+        super().__init__(parent)
+        self.state = state
+        self.columns = columns
+        self.day = date.today()
+        self.task_ids = []
+        self.running: Dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.task_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return TASK_COLUMNS[self.columns[section]]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        task = self.state.tasks.get(self.task_ids[index.row()])
+        if task is None: return None
+        key = self.columns[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(task, key)
+        if role == TASK_ID_ROLE:
+            return task.id
+        if role == VALUE_ROLE:
+            if key == "progress" and task.target_minutes:
+                return (self.minutes(task), task.target_minutes)
+            if key == "action":
+                return task.id in self.running
+        if key == "time":
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor("#2da44e" if task.id in self.running else "#e0e0e0")
+        return None
+
+    def minutes(self, task: TaskTemplate) -> int:
+        return logic.get_task_minutes_for_date(self.state, task.id, self.day)
+
+    def display(self, task: TaskTemplate, key: str):
+        if key == "title": return task.title
+        if key == "cat": return task.category
+        if key == "recur": return task.recurrence
+        if key == "target": return f"{task.target_minutes}m" if task.target_minutes else "-"
+        if key == "progress": return None if task.target_minutes else "-"
+        if key == "xp": return str(task.xp_reward)
+        if key == "stat": return task.stat_name or "-"
+        if key == "total": return f"{self.minutes(task)} min"
+        if key == "time":
+            start = self.running.get(task.id)
+            return format_hms(now_ts() - start) if start is not None else "-"
+        return None
+
+    # --- Row updates ---
+
+    def task_id_at(self, row: int) -> Optional[str]:
+        return self.task_ids[row] if 0 <= row < len(self.task_ids) else None
+
+    def set_tasks(self, task_ids, day: date):
+        """Syncs rows to task_ids with row inserts/removes; resets only on a new day."""
+        if day != self.day or not self.task_ids:
+            self.beginResetModel()
+            self.day = day
+            self.task_ids = list(task_ids)
+            self.endResetModel()
+            return
+        wanted = set(task_ids)
+        for row in range(len(self.task_ids) - 1, -1, -1):
+            if self.task_ids[row] not in wanted:
+                self.remove_row(row)
+        # Both lists follow state.tasks order, so the rest is a subsequence
+        for row, task_id in enumerate(task_ids):
+            if row >= len(self.task_ids) or self.task_ids[row] != task_id:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.task_ids.insert(row, task_id)
+                self.endInsertRows()
+        self.rows_changed(0, len(self.task_ids) - 1)
+
+    def remove_row(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.task_ids[row]
+        self.endRemoveRows()
+
+    def remove_task(self, task_id: str):
+        if task_id in self.task_ids:
+            self.remove_row(self.task_ids.index(task_id))
+
+    def insert_task(self, task_id: str):
+        """Inserts at the task's position in state.tasks order (no-op if present)."""
+        if task_id in self.task_ids: return
+        order = {tid: i for i, tid in enumerate(self.state.tasks)}
+        rank = order.get(task_id, len(order))
+        row = next((r for r, tid in enumerate(self.task_ids) if order.get(tid, len(order)) > rank), len(self.task_ids))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.task_ids.insert(row, task_id)
+        self.endInsertRows()
+
+    def task_changed(self, task_id: str, keys=None):
+        """Repaints one task's row, or only its `keys` columns."""
+        if task_id not in self.task_ids: return
+        row = self.task_ids.index(task_id)
+        cols = [i for i, k in enumerate(self.columns) if keys is None or k in keys]
+        if cols:
+            self.dataChanged.emit(self.index(row, min(cols)), self.index(row, max(cols)))
+
+    def rows_changed(self, first: int, last: int):
+        if last >= first:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.columns) - 1))
+
+class ProgressDelegate(QStyledItemDelegate):
+    """Paints (done, target) minutes as a bar instead of a QProgressBar per row."""
+
+    def paint(self, painter, option, index):
+        value = index.data(VALUE_ROLE)
+        if not value:
+            super().paint(painter, option, index)
+            return
+        done, target = value
+        rect = option.rect.adjusted(4, 4, -4, -4)
+        painter.save()
+        painter.setPen(QColor("#454545"))
+        painter.setBrush(QColor("#2d2d2d"))
+        painter.drawRoundedRect(rect, 4, 4)
+        filled = int(rect.width() * min(done, target) / target)
+        if filled > 0:
+            chunk = QRect(rect.left(), rect.top(), filled, rect.height())
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#007acc"))
+            painter.drawRoundedRect(chunk, 4, 4)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, f"{done}/{target} min")
+        painter.restore()
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Paints a Start/Stop button and reports clicks with the row's task id."""
+
+    def __init__(self, on_click: Callable, parent=None):
+        super().__init__(parent)
+        self.on_click = on_click
+
+    def paint(self, painter, option, index):
+        running = bool(index.data(VALUE_ROLE))
+        rect = option.rect.adjusted(4, 2, -4, -2)
+        painter.save()
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#d73a49" if running else "#2da44e"))
+        painter.drawRoundedRect(rect, 4, 4)
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Stop" if running else "Start")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and \
+                event.button() == Qt.MouseButton.LeftButton and \
+                option.rect.contains(event.position().toPoint()):
+            # Deferred: the click may move this row to the other table
+            task_id = index.data(TASK_ID_ROLE)
+            QTimer.singleShot(0, lambda: self.on_click(task_id))
+            return True
+        return False
 
 class TasksPage(QWidget):
-    def __init__(self, state: AppState, on_action_callback: Callable, parent=None):
+    def __init__(self, state: AppState, saver: BackgroundSaver, on_action_callback: Callable, parent=None):
         super().__init__(parent)
         self.state = state
+        self.saver = saver
         self.on_action_callback = on_action_callback
+        self.shown_minutes: Dict[str, int] = {}
         self.init_ui()
 
     def init_ui(self):
@@ -387,86 +600,68 @@ class TasksPage(QWidget):
         layout.addLayout(header)
         
         layout.addWidget(QLabel("🚀 Active Tasks"))
-        self.active_table = QTableWidget()
-        self.setup_table(self.active_table, ["Title", "Recur", "Target", "Progress", "XP", "Stat", "Active Time", "Action"])
-        self.active_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.active_table.customContextMenuRequested.connect(lambda pos: self.show_context_menu(pos, self.active_table))
+        self.active_model = TaskTableModel(self.state, ("title", "recur", "target", "progress", "xp", "stat", "time", "action"), self)
+        self.active_table = self.setup_table(self.active_model)
+        self.progress_delegate = ProgressDelegate(self.active_table)
+        self.action_delegate = ActionButtonDelegate(self.on_action_callback, self.active_table)
+        self.active_table.setItemDelegateForColumn(3, self.progress_delegate)
+        self.active_table.setItemDelegateForColumn(7, self.action_delegate)
         layout.addWidget(self.active_table)
         
         layout.addWidget(QLabel("✅ Completed Today"))
-        self.comp_table = QTableWidget()
-        self.setup_table(self.comp_table, ["Title", "Cat", "Recur", "Target", "Total Time"])
-        self.comp_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.comp_table.customContextMenuRequested.connect(lambda pos: self.show_context_menu(pos, self.comp_table))
+        self.comp_model = TaskTableModel(self.state, ("title", "cat", "recur", "target", "total"), self)
+        self.comp_table = self.setup_table(self.comp_model)
         layout.addWidget(self.comp_table)
         self.refresh()
 
-    def setup_table(self, table, headers):
-        table.setColumnCount(len(headers))
-        table.setHorizontalHeaderLabels(headers)
+    def setup_table(self, model: TaskTableModel) -> QTableView:
+        table = QTableView()
+        table.setModel(model)
         table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         table.verticalHeader().setVisible(False)
-        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        table.customContextMenuRequested.connect(lambda pos: self.show_context_menu(pos, table))
+        return table
 
-    def refresh(self):
-        today = date.today()
-        all_tasks = logic.get_tasks_for_date(self.state, today)
+    def split_today(self, today: date):
         active_list = []
         completed_list = []
-        for t in all_tasks:
-            if logic.is_task_completed_for_date(self.state, t, today): completed_list.append(t)
-            else: active_list.append(t)
-        self.active_table.setRowCount(len(active_list))
-        for r, t in enumerate(active_list): self.set_active_row(r, t, today)
-        self.comp_table.setRowCount(len(completed_list))
-        for r, t in enumerate(completed_list): self.set_completed_row(r, t, today)
-
-    def set_active_row(self, row, t: TaskTemplate, today: date):
-        item_title = QTableWidgetItem(t.title)
-        item_title.setData(Qt.ItemDataRole.UserRole, t.id)
-        self.active_table.setItem(row, 0, item_title)
-        self.active_table.setItem(row, 1, QTableWidgetItem(t.recurrence))
-        target_str = f"{t.target_minutes}m" if t.target_minutes else "-"
-        self.active_table.setItem(row, 2, QTableWidgetItem(target_str))
-        mins_done = logic.get_task_minutes_for_date(self.state, t.id, today)
-        if t.target_minutes:
-            pbar = QProgressBar()
-            pbar.setRange(0, t.target_minutes)
-            pbar.setValue(min(mins_done, t.target_minutes))
-            pbar.setFormat(f"{mins_done}/{t.target_minutes} min")
-            pbar.setStyleSheet("QProgressBar { text-align: center; }")
-            self.active_table.setCellWidget(row, 3, pbar)
-        else: self.active_table.setItem(row, 3, QTableWidgetItem("-"))
-        self.active_table.setItem(row, 4, QTableWidgetItem(str(t.xp_reward)))
-        self.active_table.setItem(row, 5, QTableWidgetItem(t.stat_name or "-"))
-        active_sess = logic.get_active_session(self.state, t.id)
-        dur_item = QTableWidgetItem("..." if active_sess else "-")
-        dur_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.active_table.setItem(row, 6, dur_item)
-        btn_widget = QWidget()
-        l = QHBoxLayout(btn_widget); l.setContentsMargins(4,2,4,2)
-        btn = QPushButton("Stop" if active_sess else "Start")
-        btn.setProperty("class", "StopButton" if active_sess else "StartButton")
-        btn.clicked.connect(lambda ch, tid=t.id: self.on_action_callback(tid))
-        l.addWidget(btn)
-        self.active_table.setCellWidget(row, 7, btn_widget)
-
-    def set_completed_row(self, row, t: TaskTemplate, today: date):
-        item_title = QTableWidgetItem(t.title)
-        item_title.setData(Qt.ItemDataRole.UserRole, t.id)
-        mins_done = logic.get_task_minutes_for_date(self.state, t.id, today)
-        self.comp_table.setItem(row, 0, item_title)
-        self.comp_table.setItem(row, 1, QTableWidgetItem(t.category))
-        self.comp_table.setItem(row, 2, QTableWidgetItem(t.recurrence))
-        self.comp_table.setItem(row, 3, QTableWidgetItem(str(t.target_minutes or "-")))
-        self.comp_table.setItem(row, 4, QTableWidgetItem(f"{mins_done} min"))
-
-    def show_context_menu(self, pos: QPoint, table: QTableWidget):
+        for t in logic.get_tasks_for_date(self.state, today):
+            if logic.is_task_completed_for_date(self.state, t, today): completed_list.append(t.id)
+            else: active_list.append(t.id)
+        return active_list, completed_list
+
+    def refresh(self):
+        today = date.today()
+        active_list, completed_list = self.split_today(today)
+        self.active_model.set_tasks(active_list, today)
+        self.comp_model.set_tasks(completed_list, today)
+
+    def task_changed(self, task_id: str):
+        """Moves or repaints the single row a mutation touched."""
+        today = date.today()
+        if today != self.active_model.day:
+            self.refresh()
+            return
+        task = self.state.tasks.get(task_id)
+        if task is None or not logic.is_task_scheduled_for_date(task, today):
+            self.active_model.remove_task(task_id)
+            self.comp_model.remove_task(task_id)
+            return
+        if logic.is_task_completed_for_date(self.state, task, today):
+            src, dst = self.active_model, self.comp_model
+        else:
+            src, dst = self.comp_model, self.active_model
+        src.remove_task(task_id)
+        dst.insert_task(task_id)
+        dst.task_changed(task_id)
+
+    def show_context_menu(self, pos: QPoint, table: QTableView):
         index = table.indexAt(pos)
         if not index.isValid(): return
-        item = table.item(index.row(), 0)
-        task_id = item.data(Qt.ItemDataRole.UserRole)
+        task_id = table.model().task_id_at(index.row())
         menu = QMenu()
         edit_act = QAction("Edit Task", self)
         del_act = QAction("Delete Task", self)
@@ -480,13 +675,12 @@ class TasksPage(QWidget):
         dlg = TaskDialog(self)
         if dlg.exec():
             data = dlg.get_data()
-            logic.add_task_definition(
-                self.state, data["title"], data["desc"], data["cat"], 
+            task = self.saver.mutate(
+                logic.add_task_definition, data["title"], data["desc"], data["cat"], 
                 data["recurrence"], data["target"], data["xp"], data["points"], 
                 data["stat"], custom_every_n_days=data["custom_n"], custom_weekdays=data["custom_days"]
             )
-            self.refresh()
-            storage.save_state(self.state)
+            self.task_changed(task.id)
 
     def open_edit_dialog(self, task_id):
         task = self.state.tasks.get(task_id)
@@ -494,57 +688,41 @@ class TasksPage(QWidget):
         dlg = TaskDialog(self, task)
         if dlg.exec():
             data = dlg.get_data()
-            task.title = data["title"]
-            task.description = data["desc"]
-            task.category = data["cat"]
-            task.recurrence = data["recurrence"]
-            task.target_minutes = data["target"]
-            task.xp_reward = data["xp"]
-            task.point_reward = data["points"]
-            task.stat_name = data["stat"]
-            task.custom_every_n_days = data["custom_n"]
-            task.custom_weekdays = data["custom_days"]
-            storage.save_state(self.state)
-            self.refresh()
+            self.saver.mutate(
+                logic.update_task_definition, task_id, data["title"], data["desc"], data["cat"],
+                data["recurrence"], data["target"], data["xp"], data["points"],
+                data["stat"], custom_every_n_days=data["custom_n"], custom_weekdays=data["custom_days"]
+            )
+            self.task_changed(task_id)
 
     def delete_task(self, task_id):
         if QMessageBox.question(self, "Confirm", "Delete task?") == QMessageBox.StandardButton.Yes:
             if task_id in self.state.tasks:
-                del self.state.tasks[task_id]
-                storage.save_state(self.state)
-                self.refresh()
+                self.saver.mutate(logic.delete_task_definition, task_id)
+                self.task_changed(task_id)
+
+    def set_running(self, running: Dict[str, int]):
+        stopped = [tid for tid in self.active_model.running if tid not in running]
+        self.active_model.running = running
+        self.shown_minutes = {tid: m for tid, m in self.shown_minutes.items() if tid in running}
+        for task_id in stopped:
+            self.active_model.task_changed(task_id)
 
     def update_timers(self):
-        for row in range(self.active_table.rowCount()):
-            item_title = self.active_table.item(row, 0)
-            if not item_title: continue
-            task_id = item_title.data(Qt.ItemDataRole.UserRole)
-            task = self.state.tasks.get(task_id)
-            if task and task.target_minutes:
-                mins = logic.get_task_minutes_for_date(self.state, task_id, date.today())
-                pbar = self.active_table.cellWidget(row, 3)
-                if isinstance(pbar, QProgressBar):
-                    pbar.setValue(min(mins, task.target_minutes))
-                    pbar.setFormat(f"{mins}/{task.target_minutes} min")
-            active_sess = logic.get_active_session(self.state, task_id)
-            item_dur = self.active_table.item(row, 6)
-            if active_sess:
-                start_dt = datetime.fromisoformat(active_sess.start_time)
-                delta = datetime.now() - start_dt
-                ts = int(delta.total_seconds())
-                m, s = divmod(ts, 60)
-                h, m = divmod(m, 60)
-                item_dur.setText(f"{h:02d}:{m:02d}:{s:02d}")
-                item_dur.setForeground(QColor("#2da44e"))
-            else:
-                item_dur.setText("-")
-                item_dur.setForeground(QColor("#e0e0e0"))
+        # Only running rows change; progress only when the task's total minutes do
+        day = self.active_model.day
+        for task_id in self.active_model.running:
+            minutes = logic.get_task_minutes_for_date(self.state, task_id, day)
+            keys = ("time",) if self.shown_minutes.get(task_id) == minutes else ("progress", "total", "time", "action")
+            self.shown_minutes[task_id] = minutes
+            self.active_model.task_changed(task_id, keys)
 
 # --- NEW: Book Page ---
 class BookPage(QWidget):
-    def __init__(self, state: AppState, parent=None):
+    def __init__(self, state: AppState, saver: BackgroundSaver, parent=None):
         super().__init__(parent)
         self.state = state
+        self.saver = saver
         self.init_ui()
 
     def init_ui(self):
@@ -555,75 +733,82 @@ class BookPage(QWidget):
         self.lbl_header.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
         self.layout.addWidget(self.lbl_header)
         
-        # Content Container
+        # Both views are built once; refresh() only toggles and fills them
+        self.lbl_empty = QLabel("No active book project found.\nGo to 'Routines' tab to create one!")
+        self.lbl_empty.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lbl_empty.setStyleSheet("color: #888; font-size: 16px; margin-top: 50px;")
+        self.layout.addWidget(self.lbl_empty)
+
         self.content_widget = QWidget()
         self.content_layout = QVBoxLayout(self.content_widget)
-        self.layout.addWidget(self.content_widget)
-        
-        self.layout.addStretch()
-
-    def refresh(self):
-        # Clear previous UI
-        while self.content_layout.count():
-            child = self.content_layout.takeAt(0)
-            if child.widget(): child.widget().deleteLater()
-
-        # Find active book
-        active_book = next((b for b in self.state.book_projects.values() if not b.is_completed), None)
-        
-        if not active_book:
-            lbl = QLabel("No active book project found.\nGo to 'Routines' tab to create one!")
-            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            lbl.setStyleSheet("color: #888; font-size: 16px; margin-top: 50px;")
-            self.content_layout.addWidget(lbl)
-            return
 
         # Display Book Details
-        title_lbl = QLabel(f"📖 {active_book.title}")
-        title_lbl.setStyleSheet("font-size: 24px; font-weight: bold; color: #007acc; margin-bottom: 10px;")
-        
+        self.title_lbl = QLabel()
+        self.title_lbl.setStyleSheet("font-size: 24px; font-weight: bold; color: #007acc; margin-bottom: 10px;")
+
         # Progress Bar
-        pbar = QProgressBar()
-        pbar.setRange(0, active_book.total_pages)
-        pbar.setValue(active_book.pages_written)
-        pbar.setFormat(f"%v / {active_book.total_pages} pages")
-        pbar.setStyleSheet("QProgressBar { height: 30px; font-size: 14px; }")
-        
-        stats_lbl = QLabel(f"Remaining: {active_book.total_pages - active_book.pages_written} pages | Daily Target: {active_book.daily_target_pages}")
-        stats_lbl.setStyleSheet("font-size: 14px; color: #ccc; margin-bottom: 20px;")
-        
+        self.pbar = QProgressBar()
+        self.pbar.setStyleSheet("QProgressBar { height: 30px; font-size: 14px; }")
+
+        self.stats_lbl = QLabel()
+        self.stats_lbl.setStyleSheet("font-size: 14px; color: #ccc; margin-bottom: 20px;")
+
         # Input Section
         input_group = QGroupBox("Log Progress")
         input_form = QFormLayout()
-        
+
         self.pages_spin = QSpinBox()
         self.pages_spin.setRange(1, 500)
-        self.pages_spin.setValue(active_book.daily_target_pages)
-        
+
         btn_save = QPushButton("Save Progress")
         btn_save.setProperty("class", "ActionButton")
-        btn_save.clicked.connect(lambda: self.save_progress(active_book))
-        
+        btn_save.clicked.connect(self.save_progress)
+
         input_form.addRow("Pages Written Today:", self.pages_spin)
         input_form.addRow(btn_save)
         input_group.setLayout(input_form)
-        
-        self.content_layout.addWidget(title_lbl)
-        self.content_layout.addWidget(pbar)
-        self.content_layout.addWidget(stats_lbl)
+
+        self.content_layout.addWidget(self.title_lbl)
+        self.content_layout.addWidget(self.pbar)
+        self.content_layout.addWidget(self.stats_lbl)
         self.content_layout.addWidget(input_group)
+        self.layout.addWidget(self.content_widget)
+
+        self.layout.addStretch()
+        self.book_id: Optional[str] = None
+
+    def refresh(self):
+        # Find active book
+        active_book = next((b for b in self.state.book_projects.values() if not b.is_completed), None)
+        self.lbl_empty.setVisible(active_book is None)
+        self.content_widget.setVisible(active_book is not None)
+        if not active_book:
+            self.book_id = None
+            return
 
-    def save_progress(self, book):
+        if active_book.id != self.book_id:
+            self.book_id = active_book.id
+            self.pages_spin.setValue(active_book.daily_target_pages)
+        self.title_lbl.setText(f"📖 {active_book.title}")
+        self.pbar.setRange(0, active_book.total_pages)
+        self.pbar.setValue(active_book.pages_written)
+        self.pbar.setFormat(f"%v / {active_book.total_pages} pages")
+        self.stats_lbl.setText(f"Remaining: {active_book.total_pages - active_book.pages_written} pages | Daily Target: {active_book.daily_target_pages}")
+
+    def save_progress(self):
+        book = self.state.book_projects.get(self.book_id)
+        if not book: return
         count = self.pages_spin.value()
-        logic.update_book_progress(self.state, book.id, count, date.today())
-        storage.save_state(self.state)
+        self.saver.mutate(logic.update_book_progress, book.id, count, date.today())
         QMessageBox.information(self, "Success", f"Logged {count} pages for '{book.title}'!")
+        self.pages_spin.setValue(book.daily_target_pages)
         self.refresh()
 
 class RoutinesPage(QWidget):
-    def __init__(self, state: AppState, parent=None):
+    def __init__(self, state: AppState, saver: BackgroundSaver, parent=None):
         super().__init__(parent)
         self.state = state
+        self.saver = saver
         self.init_ui()
 
     def init_ui(self):
@@ -637,6 +822,22 @@ class RoutinesPage(QWidget):
         # 1. Book Project (Creation Only)
         self.book_group = QGroupBox("Create New Book Project")
         self.book_layout = QVBoxLayout()
+        self.book_form = QWidget()
+        form = QFormLayout(self.book_form)
+        form.setContentsMargins(0, 0, 0, 0)
+        self.book_title_edit = QLineEdit()
+        self.book_total_edit = QSpinBox(); self.book_total_edit.setRange(1, 5000)
+        self.book_daily_edit = QSpinBox(); self.book_daily_edit.setRange(1, 500); self.book_daily_edit.setValue(5)
+        btn_create = QPushButton("Create Book Project"); btn_create.setProperty("class", "ActionButton")
+        btn_create.clicked.connect(self.create_book)
+        form.addRow("Title:", self.book_title_edit)
+        form.addRow("Total Pages:", self.book_total_edit)
+        form.addRow("Daily Target:", self.book_daily_edit)
+        form.addRow(btn_create)
+        self.lbl_active_book = QLabel()
+        self.lbl_active_book.setStyleSheet("color: #2da44e;")
+        self.book_layout.addWidget(self.book_form)
+        self.book_layout.addWidget(self.lbl_active_book)
         self.book_group.setLayout(self.book_layout)
         self.layout.addWidget(self.book_group)
 
@@ -716,38 +917,16 @@ class RoutinesPage(QWidget):
         log = self.state.daily_logs.get(d_str)
 
         # 1. Book Creation Refresh
-        # Only show form if no active book exists, OR always show but maybe collapsed?
         # User requested: "Routines kısmından sadece proje oluşturulsun"
-        # I'll hide the group if there is an active book to keep it clean, 
-        # or show a label saying "Active book exists".
-        
-        while self.book_layout.count():
-            child = self.book_layout.takeAt(0)
-            if child.widget(): child.widget().deleteLater()
-            
+        # The form shows only while no book is active; otherwise a status line.
         active_book = next((b for b in self.state.book_projects.values() if not b.is_completed), None)
-        
+        self.book_form.setVisible(active_book is None)
+        self.lbl_active_book.setVisible(active_book is not None)
         if not active_book:
-            self.book_group.setVisible(True)
             self.book_group.setTitle("Create New Book Project")
-            form = QFormLayout()
-            self.book_title_edit = QLineEdit()
-            self.book_total_edit = QSpinBox(); self.book_total_edit.setRange(1, 5000)
-            self.book_daily_edit = QSpinBox(); self.book_daily_edit.setRange(1, 500); self.book_daily_edit.setValue(5)
-            btn_create = QPushButton("Create Book Project"); btn_create.setProperty("class", "ActionButton")
-            btn_create.clicked.connect(self.create_book)
-            form.addRow("Title:", self.book_title_edit)
-            form.addRow("Total Pages:", self.book_total_edit)
-            form.addRow("Daily Target:", self.book_daily_edit)
-            form.addRow(btn_create)
-            self.book_layout.addLayout(form)
         else:
-            # Hide the creation group or show info
-            self.book_group.setVisible(True)
             self.book_group.setTitle("Book Project Status")
-            lbl = QLabel(f"Active Project: '{active_book.title}'\nGo to 'Book' tab to manage progress.")
-            lbl.setStyleSheet("color: #2da44e;")
-            self.book_layout.addWidget(lbl)
+            self.lbl_active_book.setText(f"Active Project: '{active_book.title}'\nGo to 'Book' tab to manage progress.")
 
         # 2. Zikr Refresh
         target = self.state.settings.zikr_daily_target
@@ -756,7 +935,8 @@ class RoutinesPage(QWidget):
         self.spin_zikr.setValue(log.zikr_count if log else 0)
 
         # 3. Income Refresh
-        self.lbl_income_target.setText(f"Monthly Target: {self.state.settings.monthly_income_target}")
+        income, target = logic.get_income_progress(self.state, today)
+        self.lbl_income_target.setText(f"Monthly Target: {target} (this month: {income:.2f})")
         self.spin_income.setValue(log.income_amount if log else 0.0)
 
         # 4. Amca Refresh
@@ -780,44 +960,46 @@ class RoutinesPage(QWidget):
     def create_book(self):
         title = self.book_title_edit.text()
         if not title: return
-        logic.create_book_project(self.state, title, self.book_total_edit.value(), self.book_daily_edit.value())
-        self.save_and_notify("Book project created!")
+        self.saver.mutate(logic.create_book_project, title, self.book_total_edit.value(), self.book_daily_edit.value())
+        self.book_title_edit.clear()
+        self.notify("Book project created!")
         self.refresh()
 
     def update_zikr_target(self):
         val = self.spin_zikr_target.value()
-        logic.update_zikr_target(self.state, val)
-        self.save_and_notify(f"Zikr target updated to {val}!")
+        self.saver.mutate(logic.update_zikr_target, val)
+        self.notify(f"Zikr target updated to {val}!")
         self.refresh()
 
     def save_zikr(self):
-        logic.set_daily_zikr(self.state, date.today(), self.spin_zikr.value())
-        self.save_and_notify("Zikr count saved!")
+        self.saver.mutate(logic.set_daily_zikr, date.today(), self.spin_zikr.value())
+        self.notify("Zikr count saved!")
 
     def save_income(self):
-        logic.set_daily_income(self.state, date.today(), self.spin_income.value())
-        self.save_and_notify("Daily income saved and wallet updated!")
+        self.saver.mutate(logic.set_daily_income, date.today(), self.spin_income.value())
+        self.notify("Daily income saved and wallet updated!")
 
     def add_amca(self):
-        logic.add_amca_action(self.state, self.spin_amca_xp.value())
-        self.save_and_notify("Amca action added!")
+        self.saver.mutate(logic.add_amca_action, self.spin_amca_xp.value())
+        self.notify("Amca action added!")
         self.refresh()
 
     def save_wake(self):
         t_str = self.time_target.time().toString("HH:mm")
         a_str = self.time_actual.time().toString("HH:mm")
-        logic.apply_wake_times(self.state, date.today(), t_str, a_str)
-        self.save_and_notify("Wake times saved!")
+        self.saver.mutate(logic.apply_wake_times, date.today(), t_str, a_str)
+        self.notify("Wake times saved!")
         self.refresh()
 
-    def save_and_notify(self, msg):
-        storage.save_state(self.state)
+    def notify(self, msg):
+        # Persisting is left to the background saver
         QMessageBox.information(self, "Success", msg)
 
 class ProfilePage(QWidget):
-    def __init__(self, state: AppState, parent=None):
+    def __init__(self, state: AppState, saver: BackgroundSaver, parent=None):
         super().__init__(parent)
         self.state = state
+        self.saver = saver
         self.init_ui()
 
     def init_ui(self):
@@ -859,6 +1041,7 @@ class ProfilePage(QWidget):
         self.skills_layout = QVBoxLayout()
         skills_group.setLayout(self.skills_layout)
         layout.addWidget(skills_group)
+        self.stat_rows: Dict[str, tuple] = {}  # stat name -> (row widget, label, bar)
         
         layout.addStretch()
         self.refresh()
@@ -870,44 +1053,72 @@ class ProfilePage(QWidget):
         self.lbl_xp.setText(f"{p.xp:,}")
         self.lbl_streak.setText(f"{p.streak_days} days (Freezes: {p.streak_freezes})")
         
-        # Refresh Skills List
-        # Clear layout
-        while self.skills_layout.count():
-            item = self.skills_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Add bars
+        # Rows are only added/removed when the set of stats changes
+        for name in [n for n in self.stat_rows if n not in self.state.stats]:
+            row = self.stat_rows.pop(name)[0]
+            self.skills_layout.removeWidget(row)
+            row.deleteLater()
         for name, stat in self.state.stats.items():
-            h = QHBoxLayout()
-            lbl = QLabel(f"{name.title()} (Lvl {stat.level()})")
-            lbl.setFixedWidth(150)
-            
-            bar = QProgressBar()
-            bar.setRange(0, 100)
+            if name not in self.stat_rows:
+                self.stat_rows[name] = self.add_stat_row()
+            _, lbl, bar = self.stat_rows[name]
+            lbl.setText(f"{name.title()} (Lvl {stat.level()})")
             bar.setValue(int(stat.progress_to_next_level() * 100))
-            bar.setTextVisible(True)
-            
-            h.addWidget(lbl)
-            h.addWidget(bar)
-            self.skills_layout.addLayout(h)
+
+    def add_stat_row(self) -> tuple:
+        row = QWidget()
+        h = QHBoxLayout(row)
+        h.setContentsMargins(0, 0, 0, 0)
+        lbl = QLabel()
+        lbl.setFixedWidth(150)
+        
+        bar = QProgressBar()
+        bar.setRange(0, 100)
+        bar.setTextVisible(True)
+        
+        h.addWidget(lbl)
+        h.addWidget(bar)
+        self.skills_layout.addWidget(row)
+        return row, lbl, bar
 
     def open_edit_dialog(self):
-        dlg = ProfileEditDialog(self.state, self)
+        dlg = ProfileEditDialog(self.state, self.saver, self)
         if dlg.exec():
             self.refresh()
-            storage.save_state(self.state)
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted from the saver thread; Qt queues it to the GUI thread
+    state_written = pyqtSignal()
+
+    def __init__(self, use_daemon: bool = False):
         super().__init__()
         self.setWindowTitle("Life Gamification App v3.3")
         self.resize(1100, 750)
-        self.state = storage.load_state()
+        client = DaemonClient.connect() if use_daemon else None
+        if client:
+            # The daemon owns the state and did the streak backfill itself
+            self.saver = RemoteSaver(client, on_write=self.state_written.emit)
+            self.state = self.saver.state
+        else:
+            self.state = storage.load_state()
+            self.saver = BackgroundSaver(
+                self.state, on_write=self.state_written.emit,
+                on_error=lambda message: self.state_written.emit())
+            self.saver.mutate(logic.backfill_streaks, date.today())
+        self.running: Dict[str, int] = {}
+        self.shown_day: Optional[date] = None
         self.init_ui()
-        self.timer = QTimer()
+        self.state_written.connect(self.update_save_status)
+        self.update_save_status()
+
+        # 1 Hz only while a timer runs; the date label has its own midnight timer
+        self.timer = QTimer(self)
         self.timer.timeout.connect(self.on_tick)
-        self.timer.start(1000)
+        self.day_timer = QTimer(self)
+        self.day_timer.setSingleShot(True)
+        self.day_timer.timeout.connect(self.on_new_day)
+        self.schedule_day_change()
+        self.timers_changed()
 
     def init_ui(self):
         central = QWidget()
@@ -941,13 +1152,16 @@ class MainWindow(QMainWindow):
         side_layout.addWidget(self.btn_book)
         side_layout.addStretch()
         side_layout.addWidget(QLabel("v3.3 Profile Edit"))
+        self.lbl_save_status = QLabel()
+        self.lbl_save_status.setStyleSheet("color: #666666; font-size: 11px; padding-left: 10px;")
+        side_layout.addWidget(self.lbl_save_status)
         
         self.stack = QStackedWidget()
         self.page_dash = DashboardPage(self.state)
-        self.page_profile = ProfilePage(self.state) # NEW
-        self.page_tasks = TasksPage(self.state, self.handle_task_action)
-        self.page_routines = RoutinesPage(self.state)
-        self.page_book = BookPage(self.state)
+        self.page_profile = ProfilePage(self.state, self.saver) # NEW
+        self.page_tasks = TasksPage(self.state, self.saver, self.handle_task_action)
+        self.page_routines = RoutinesPage(self.state, self.saver)
+        self.page_book = BookPage(self.state, self.saver)
         
         self.stack.addWidget(self.page_dash)
         self.stack.addWidget(self.page_profile) # NEW
@@ -967,6 +1181,8 @@ class MainWindow(QMainWindow):
 
     def update_date_label(self):
         now = datetime.now()
+        if now.date() == self.shown_day: return
+        self.shown_day = now.date()
         day_map = {
             "Monday": "Pazartesi", "Tuesday": "Salı", "Wednesday": "Çarşamba",
             "Thursday": "Perşembe", "Friday": "Cuma", "Saturday": "Cumartesi", "Sunday": "Pazar"
@@ -984,6 +1200,9 @@ class MainWindow(QMainWindow):
         return btn
 
     def switch_page(self, index):
+        if self.saver.sync():
+            self.timers_changed()
+        self.update_date_label()
         self.stack.setCurrentIndex(index)
         if index == 0: self.page_dash.refresh()
         elif index == 1: self.page_profile.refresh() # NEW
@@ -991,39 +1210,85 @@ class MainWindow(QMainWindow):
         elif index == 3: self.page_routines.refresh()
         elif index == 4: self.page_book.refresh()
 
+    def schedule_day_change(self):
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self.day_timer.start(int((midnight - now).total_seconds() * 1000) + 500)
+
+    def on_new_day(self):
+        self.update_date_label()
+        self.page_tasks.refresh()
+        self.page_dash.refresh()
+        self.schedule_day_change()
+
+    def timers_changed(self):
+        """Re-reads running sessions after a start/stop; starts or idles the tick."""
+        self.running = {s.task_id: s.start_time for s in logic.get_all_active_sessions(self.state)}
+        self.page_tasks.set_running(self.running)
+        self.on_tick()
+        if not self.running:
+            self.timer.stop()
+        elif not self.timer.isActive():
+            self.timer.start(1000)
+
     def on_tick(self):
-        self.page_dash.update_active_task_label()
+        self.page_dash.update_active_task_label(self.running)
         if self.stack.currentIndex() == 2: # Check index carefully
             self.page_tasks.update_timers()
-        self.update_date_label()
+
+    def update_save_status(self):
+        st = self.saver.stats()
+        error = getattr(self.saver, "last_error", None)
+        if error:
+            self.lbl_save_status.setText(f"Save failed: {error} · {st['pending']} pending")
+        else:
+            self.lbl_save_status.setText(f"Saved in {st['last_latency_ms']:.0f} ms · {st['pending']} pending")
 
     def handle_task_action(self, task_id: str):
         active = logic.get_active_session(self.state, task_id)
         if active:
-            logic.stop_timer_for_session(self.state, active.id)
+            self.saver.mutate(logic.stop_timer_for_session, active.id)
             task = self.state.tasks.get(task_id)
             today = date.today()
+            self.timers_changed()
+            self.page_tasks.task_changed(task_id)
+            self.page_dash.refresh()
             if task and logic.is_task_completed_for_date(self.state, task, today):
                 QMessageBox.information(self, "Task Completed!", f"Great job! You finished '{task.title}' for today.")
-            self.page_tasks.refresh()
-            self.page_dash.refresh()
-            storage.save_state(self.state)
         else:
-            logic.start_timer_for_task(self.state, task_id)
-            self.page_tasks.refresh()
+            self.saver.mutate(logic.start_timer_for_task, task_id)
+            self.timers_changed()
+            self.page_tasks.task_changed(task_id)
             self.page_dash.refresh()
-            storage.save_state(self.state)
 
     def closeEvent(self, event):
-        active = logic.get_all_active_sessions(self.state)
-        for s in active: logic.stop_timer_for_session(self.state, s.id)
-        storage.save_state(self.state)
+        # With a daemon the timers outlive this window
+        if not isinstance(self.saver, RemoteSaver):
+            batch = logic.Batch()
+            for s in logic.get_all_active_sessions(self.state):
+                batch.add(logic.stop_timer_for_session, s.id)
+            if batch:
+                self.saver.mutate(logic.apply_batch, batch.operations)
+        self.timer.stop()
+        self.day_timer.stop()
+        self.saver.stop()
+        if perf.enabled():
+            print(perf.report())
         super().closeEvent(event)
 
+def install_perf() -> None:
+    perf.install()
+    perf.instrument_class(MainWindow, ("on_tick", "switch_page", "handle_task_action"))
+    for page in (DashboardPage, ProfilePage, TasksPage, RoutinesPage, BookPage):
+        perf.instrument_class(page, ("refresh", "update_timers", "update_active_task_label"))
+
 if __name__ == "__main__":
+    if "--perf" in sys.argv[1:]:
+        perf.enable()
+    install_perf()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setStyleSheet(DARK_STYLESHEET)
-    window = MainWindow()
+    window = MainWindow(use_daemon="--daemon" in sys.argv[1:])
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,137 @@
+import json
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional, Set
+
+# Month partitions for the JSON backend. History records (sessions,
+# amca actions, transactions, completions, daily logs) older than the
+# current month live in "<name>.archive/YYYY-MM.json" instead of the main
+# snapshot. Everything here works on the serialized dict shape, so the
+# journal compactor can use it without building models.
+
+HISTORY_SECTIONS = ("sessions", "daily_logs", "amca_actions", "transactions", "task_completions")
+
+def archive_dir(path: str) -> str:
+    return os.path.splitext(path)[0] + ".archive"
+
+def partition_path(path: str, month: str) -> str:
+    return os.path.join(archive_dir(path), f"{month}.json")
+
+def month_key(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+def current_month() -> str:
+    return month_key(date.today())
+
+def months_between(start: date, end: date) -> List[str]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def available_months(path: str) -> Set[str]:
+    directory = archive_dir(path)
+    if not os.path.isdir(directory):
+        return set()
+    return {name[:-5] for name in os.listdir(directory) if name.endswith(".json")}
+
+def record_month(section: str, record: Dict[str, Any]) -> Optional[str]:
+    """Partition of a serialized record; None keeps it in the main snapshot."""
+    if section == "sessions":
+        # Running sessions always stay with the live state
+        return None if record.get("end_time") is None else record["start_time"][:7]
+    if section in ("amca_actions", "transactions"):
+        return record["timestamp"][:7]
+    return record["date"][:7]
+
+def empty_partition() -> Dict[str, Any]:
+    return {"sessions": {}, "daily_logs": {}, "amca_actions": [], "transactions": [], "task_completions": []}
+
+def _history(data: Dict[str, Any], section: str) -> Any:
+    if section == "transactions":
+        return data.setdefault("wallet", {}).setdefault("transactions", [])
+    default = {} if section in ("sessions", "daily_logs") else []
+    return data.setdefault(section, default)
+
+def split(data: Dict[str, Any], keep_from: str) -> Dict[str, Dict[str, Any]]:
+    """Moves history older than month keep_from out of data, by month."""
+    parts: Dict[str, Dict[str, Any]] = {}
+    for section in HISTORY_SECTIONS:
+        records = _history(data, section)
+        if isinstance(records, dict):
+            for key in list(records):
+                month = record_month(section, records[key])
+                if month is not None and month < keep_from:
+                    parts.setdefault(month, empty_partition())[section][key] = records.pop(key)
+        else:
+            kept = []
+            for record in records:
+                month = record_month(section, record)
+                if month is not None and month < keep_from:
+                    parts.setdefault(month, empty_partition())[section].append(record)
+                else:
+                    kept.append(record)
+            records[:] = kept
+    return parts
+
+def merge(base: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """Union of two partitions; records in newer replace same-id ones in base."""
+    for section in HISTORY_SECTIONS:
+        incoming = newer.get(section)
+        if not incoming:
+            continue
+        if isinstance(incoming, dict):
+            base.setdefault(section, {}).update(incoming)
+        else:
+            replaced = {r["id"]: r for r in incoming}
+            kept = [r for r in base.get(section, []) if r["id"] not in replaced]
+            base[section] = kept + incoming
+    return base
+
+def read_partition(path: str, month: str) -> Dict[str, Any]:
+    p_path = partition_path(path, month)
+    if not os.path.exists(p_path):
+        return empty_partition()
+    with open(p_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def remove(part: Dict[str, Any], deleted: Dict[str, Set[str]]) -> bool:
+    """Drops records by key (section -> keys) from a partition; True if any were there."""
+    removed = False
+    for section, keys in deleted.items():
+        records = part.get(section)
+        if not records:
+            continue
+        if isinstance(records, dict):
+            for key in keys & records.keys():
+                del records[key]
+                removed = True
+        else:
+            kept = [r for r in records if r["id"] not in keys]
+            removed = removed or len(kept) != len(records)
+            part[section] = kept
+    return removed
+
+def _write(path: str, month: str, part: Dict[str, Any]) -> None:
+    os.makedirs(archive_dir(path), exist_ok=True)
+    p_path = partition_path(path, month)
+    with open(p_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(part, f, ensure_ascii=False)
+    os.replace(p_path + ".tmp", p_path)
+
+def write_partition(path: str, month: str, part: Dict[str, Any]) -> None:
+    """Merges part into the month's file (memory wins) and writes it atomically."""
+    _write(path, month, merge(read_partition(path, month), part))
+
+def delete_records(path: str, deleted: Dict[str, Set[str]]) -> None:
+    """Removes deleted records from whichever partitions hold them.
+
+    Deletion events carry no record, hence no month, so every partition
+    is checked; only those that held one are rewritten.
+    """
+    for month in sorted(available_months(path)):
+        part = read_partition(path, month)
+        if remove(part, deleted):
+            _write(path, month, part)
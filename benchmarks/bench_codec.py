@@ -0,0 +1,123 @@
+"""Compares the generated codec with the previous dataclasses.asdict /
+**kwargs serialization path on a large synthetic state.
+
+    python benchmarks/bench_codec.py [sessions]
+"""
+import dataclasses
+import os
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec
+import logic
+import storage
+from models import (
+    AppState, Profile, Stat, TaskTemplate, TimerSession, AmcaAction, Wallet,
+    Transaction, BookProject, DailyRoutineLog, MaterialGoal, Settings,
+    TaskCompletion, DayRollup, TIMESTAMP_FIELDS, ts_to_iso, iso_to_ts
+)
+
+
+def build_state(n_sessions: int) -> AppState:
+    state = storage.default_state()
+    tasks = []
+    for i in range(20):
+        task = TaskTemplate(str(uuid.uuid4()), f"Task {i}", "", "general", "daily", 50, 10, 30, "yazılım")
+        state.tasks[task.id] = task
+        tasks.append(task)
+    start = 1_700_000_000
+    for i in range(n_sessions):
+        ts = start + i * 3600
+        session = TimerSession(str(uuid.uuid4()), tasks[i % len(tasks)].id, ts, 1800, ts + 1800)
+        state.sessions[session.id] = session
+        day = date.fromtimestamp(ts).isoformat()
+        state.task_completions.append(TaskCompletion(str(uuid.uuid4()), session.task_id, day))
+        if i % 4 == 0:
+            state.amca_actions.append(AmcaAction(str(uuid.uuid4()), ts, 10, "note"))
+            state.wallet.transactions.append(Transaction(str(uuid.uuid4()), ts, 12.5, "Income Adjustment", "x"))
+        state.daily_logs.setdefault(day, DailyRoutineLog(day, amca_count=1))
+    logic.rebuild_rollups(state)
+    return state
+
+
+# --- Previous path ---
+
+def legacy_encode(state: AppState):
+    def record(obj):
+        data = dataclasses.asdict(obj)
+        for name in TIMESTAMP_FIELDS.get(type(obj), ()):
+            if data[name] is not None:
+                data[name] = ts_to_iso(data[name])
+        return data
+    wallet = state.wallet
+    return {
+        "profile": dataclasses.asdict(state.profile),
+        "stats": {k: dataclasses.asdict(v) for k, v in state.stats.items()},
+        "tasks": {k: dataclasses.asdict(v) for k, v in state.tasks.items()},
+        "sessions": {k: record(v) for k, v in state.sessions.items()},
+        "amca_actions": [record(a) for a in state.amca_actions],
+        "wallet": {"balance": wallet.balance, "transactions": [record(t) for t in wallet.transactions]},
+        "book_projects": {k: dataclasses.asdict(v) for k, v in state.book_projects.items()},
+        "material_goals": {k: dataclasses.asdict(v) for k, v in state.material_goals.items()},
+        "daily_logs": {k: dataclasses.asdict(v) for k, v in state.daily_logs.items()},
+        "settings": dataclasses.asdict(state.settings),
+        "task_completions": [dataclasses.asdict(c) for c in state.task_completions],
+        "rollups": {k: dataclasses.asdict(v) for k, v in state.rollups.items()},
+    }
+
+def legacy_decode(data):
+    def record(cls, d):
+        d = dict(d)
+        for name in TIMESTAMP_FIELDS.get(cls, ()):
+            if d.get(name) is not None:
+                d[name] = iso_to_ts(d[name])
+        return cls(**d)
+    wallet = data["wallet"]
+    return AppState(
+        profile=Profile(**data["profile"]),
+        stats={k: Stat(**v) for k, v in data["stats"].items()},
+        tasks={k: TaskTemplate(**v) for k, v in data["tasks"].items()},
+        sessions={k: record(TimerSession, v) for k, v in data["sessions"].items()},
+        amca_actions=[record(AmcaAction, a) for a in data["amca_actions"]],
+        wallet=Wallet(wallet["balance"], [record(Transaction, t) for t in wallet["transactions"]]),
+        book_projects={k: BookProject(**v) for k, v in data["book_projects"].items()},
+        material_goals={k: MaterialGoal(**v) for k, v in data["material_goals"].items()},
+        daily_logs={k: DailyRoutineLog(**v) for k, v in data["daily_logs"].items()},
+        settings=Settings(**data["settings"]),
+        task_completions=[TaskCompletion(**c) for c in data["task_completions"]],
+        rollups={k: DayRollup(**v) for k, v in data["rollups"].items()},
+    )
+
+
+def best_of(fn, arg, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    state = build_state(n_sessions)
+    data = codec.encode_state(state)
+    assert legacy_encode(state) == data
+    assert codec.decode_state(data) == legacy_decode(data)
+
+    print(f"{n_sessions} sessions, best of 5")
+    print(f"{'':8}{'legacy':>12}{'codec':>12}{'speedup':>10}")
+    for name, old, new, arg in (
+        ("encode", legacy_encode, codec.encode_state, state),
+        ("decode", legacy_decode, codec.decode_state, data),
+    ):
+        t_old, t_new = best_of(old, arg), best_of(new, arg)
+        print(f"{name:8}{t_old * 1000:>10.1f}ms{t_new * 1000:>10.1f}ms{t_old / t_new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
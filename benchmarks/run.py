@@ -0,0 +1,182 @@
+"""Benchmark suite for storage, logic and the GUI refresh/tick paths.
+
+    python benchmarks/run.py [--years 3] [--tasks 40] [--output results.json]
+
+Results are written as JSON (one object with the parameters and a timing
+summary per case) so runs from different versions can be diffed.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic
+import storage
+from models import AppState, TaskTemplate
+from synthetic import generate_state
+
+
+# --- GUI paths without Qt ---
+# Mirror the logic calls TasksPage makes, minus the widgets.
+
+def simulate_tasks_refresh(state: AppState, today: date) -> List[TaskTemplate]:
+    active = []
+    for t in logic.get_tasks_for_date(state, today):
+        if logic.is_task_completed_for_date(state, t, today):
+            logic.get_task_minutes_for_date(state, t.id, today)
+        else:
+            logic.get_task_minutes_for_date(state, t.id, today)
+            logic.get_active_session(state, t.id)
+            active.append(t)
+    return active
+
+def simulate_timer_tick(state: AppState, rows: List[TaskTemplate], today: date) -> None:
+    logic.get_all_active_sessions(state)
+    for t in rows:
+        if t.target_minutes:
+            logic.get_task_minutes_for_date(state, t.id, today)
+        logic.get_active_session(state, t.id)
+
+
+# --- Harness ---
+
+def measure(fn: Callable[[], object], repeat: int, setup: Callable[[], None] = None) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "max_ms": round(max(samples), 4),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    end = date.fromisoformat(args.end) if args.end else date.today()
+    started = time.perf_counter()
+    state = generate_state(tasks=args.tasks, years=args.years, sessions_per_day=args.sessions_per_day, end=end, seed=args.seed)
+    generated_ms = round((time.perf_counter() - started) * 1000, 4)
+    results: Dict[str, Dict[str, float]] = {"generate": {"runs": 1, "min_ms": generated_ms}}
+    today = end
+    repeat = args.repeat
+
+    workdir = tempfile.mkdtemp(prefix="gamicipline-bench-")
+    try:
+        json_path = os.path.join(workdir, "state.json")
+        storage.save_state(state, json_path)
+        bin_path = os.path.join(workdir, "state.bin")
+        storage.save_state(state, bin_path, fmt="binary")
+        db_path = os.path.join(workdir, "state.db")
+        storage.save_state(state, db_path)
+        sections_path = os.path.join(workdir, "state.d")
+        storage.convert_state(json_path, sections_path)
+
+        results["save_state.json_full"] = measure(lambda: storage.save_state(state, json_path), repeat)
+        results["save_state.binary"] = measure(lambda: storage.save_state(state, bin_path), repeat)
+
+        loaded = storage.load_state(json_path)
+        def one_change():
+            logic.add_amca_action(loaded, 10)
+        results["save_state.json_journal"] = measure(
+            lambda: storage.save_state(loaded, json_path, journal=True), repeat, setup=one_change)
+        results["save_state.sqlite_incremental"] = measure(
+            lambda: storage.save_state(state, db_path), repeat, setup=lambda: logic.add_amca_action(state, 10))
+        sectioned = storage.load_state(sections_path)
+        results["save_state.sections_incremental"] = measure(
+            lambda: storage.save_state(sectioned, sections_path), repeat, setup=lambda: logic.add_amca_action(sectioned, 10))
+
+        results["load_state.json_startup"] = measure(lambda: storage.load_state(json_path), repeat)
+        def load_everything():
+            s = storage.load_state(json_path)
+            storage.load_all_history(s, json_path)
+        results["load_state.json_all_history"] = measure(load_everything, repeat)
+        results["load_state.binary"] = measure(lambda: storage.load_state(bin_path), repeat)
+        results["load_state.sqlite"] = measure(lambda: storage.load_state(db_path), repeat)
+        results["load_state.sections"] = measure(lambda: storage.load_state(sections_path), repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    tasks = list(state.tasks.values())
+    logic.get_index(state)
+    results["get_tasks_for_date"] = measure(lambda: logic.get_tasks_for_date(state, today), repeat * 10)
+    results["is_task_completed_for_date.all_tasks"] = measure(
+        lambda: [logic.is_task_completed_for_date(state, t, today) for t in tasks], repeat * 10)
+    results["get_schedule_report.1y"] = measure(
+        lambda: logic.get_schedule_report(state, today - timedelta(days=365), today), repeat)
+
+    def streak_setup():
+        state.profile.streak_days = 10
+    results["update_streak_for_date"] = measure(
+        lambda: logic.update_streak_for_date(state, today - timedelta(days=1)), repeat * 10, setup=streak_setup)
+
+    rows = simulate_tasks_refresh(state, today)
+    results["tasks_page.refresh"] = measure(lambda: simulate_tasks_refresh(state, today), repeat * 10)
+    results["tasks_page.update_timers"] = measure(lambda: simulate_timer_tick(state, rows, today), repeat * 10)
+
+    return {
+        "revision": git_revision(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": {
+            "tasks": args.tasks, "years": args.years, "sessions_per_day": args.sessions_per_day,
+            "seed": args.seed, "end": end.isoformat(), "repeat": repeat,
+        },
+        "counts": {
+            "sessions": len(state.sessions), "task_completions": len(state.task_completions),
+            "transactions": len(state.wallet.transactions), "amca_actions": len(state.amca_actions),
+            "daily_logs": len(state.daily_logs), "visible_rows": len(rows),
+        },
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=40)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--sessions-per-day", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--end", help="last generated day (YYYY-MM-DD), default today")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    # storage prints on every full save; keep the report clean
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        report = run(args)
+    finally:
+        sys.stdout = real_stdout
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Deterministic generator of large AppStates for benchmarks.
+
+The same arguments always produce the same state; `end` anchors the
+generated history (it defaults to today so the current-month partition
+has data like a real file would). Only the start of the `running` open
+sessions follows the wall clock, so their timers show sane values.
+"""
+import os
+import random
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+from models import (
+    AppState, TaskTemplate, TimerSession, AmcaAction, Transaction,
+    TaskCompletion, DailyRoutineLog
+)
+
+RECURRENCES = ("daily", "daily", "weekly", "monthly", "custom_n", "custom_days", "once")
+
+
+def generate_state(
+    tasks: int = 40, years: float = 3.0, sessions_per_day: int = 6,
+    amca_per_day: int = 2, income_every_days: int = 3, running: int = 2,
+    end: Optional[date] = None, seed: int = 0
+) -> AppState:
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=int(years * 365))
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    state = storage.default_state()
+    stat_names = list(state.stats)
+
+    task_list = []
+    for i in range(tasks):
+        kind = RECURRENCES[i % len(RECURRENCES)]
+        created = start + timedelta(days=rng.randrange(0, 60))
+        task = TaskTemplate(
+            id=new_id(), title=f"Task {i}", description="", category=rng.choice(stat_names),
+            recurrence="custom" if kind.startswith("custom") else kind,
+            xp_reward=rng.choice((10, 25, 50)), point_reward=rng.choice((5, 10)),
+            target_minutes=rng.choice((None, 15, 30, 60)), stat_name=rng.choice(stat_names),
+            created_date=created.isoformat(),
+            custom_every_n_days=rng.randint(2, 5) if kind == "custom_n" else None,
+            custom_weekdays=sorted(rng.sample(range(7), 3)) if kind == "custom_days" else None,
+        )
+        state.tasks[task.id] = task
+        task_list.append(task)
+
+    day = start
+    balance = 0.0
+    completed = set()
+    while day <= end:
+        d_str = day.isoformat()
+        midnight = int(datetime.combine(day, datetime.min.time()).timestamp())
+        log = DailyRoutineLog(date=d_str, zikr_count=rng.randint(0, 200), pages_written=rng.randint(0, 5))
+
+        for _ in range(sessions_per_day):
+            task = rng.choice(task_list)
+            begin = midnight + rng.randrange(6 * 3600, 22 * 3600)
+            duration = rng.randrange(5 * 60, 90 * 60)
+            session = TimerSession(new_id(), task.id, begin, duration, begin + duration)
+            state.sessions[session.id] = session
+            if task.stat_name:
+                state.stats[task.stat_name].total_seconds += duration
+            if task.target_minutes and duration >= task.target_minutes * 60 and (task.id, d_str) not in completed:
+                completed.add((task.id, d_str))
+                state.task_completions.append(TaskCompletion(new_id(), task.id, d_str))
+
+        for ts in sorted(midnight + rng.randrange(0, 86400) for _ in range(amca_per_day)):
+            state.amca_actions.append(AmcaAction(new_id(), ts, 10, rng.choice((None, "call", "visit"))))
+            log.amca_count += 1
+
+        if income_every_days and rng.randrange(income_every_days) == 0:
+            amount = round(rng.uniform(50, 800), 2)
+            log.income_amount = amount
+            balance += amount
+            state.wallet.transactions.append(Transaction(
+                new_id(), midnight + 20 * 3600, amount, "Income Adjustment", f"Manual routine update for {d_str}"
+            ))
+
+        state.daily_logs[d_str] = log
+        day += timedelta(days=1)
+
+    # A few timers left running today, like a window that is open right now
+    now = int(datetime.now().timestamp()) if end == date.today() else midnight + 12 * 3600
+    for task in task_list[:running]:
+        session = TimerSession(new_id(), task.id, now - rng.randrange(60, 3600))
+        state.sessions[session.id] = session
+
+    state.wallet.balance = balance
+    state.profile.xp = rng.randint(10_000, 100_000)
+    state.profile.streak_days = rng.randint(0, 300)
+    return state
@@ -0,0 +1,178 @@
+import json
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import codec
+from models import (
+    AppState, Profile, Stat, TaskTemplate, TimerSession, AmcaAction, Wallet,
+    Transaction, BookProject, DailyRoutineLog, MaterialGoal, Settings, TaskCompletion, DayRollup
+)
+
+# Compact binary snapshot. Layout (little-endian):
+#   MAGIC, u16 version
+#   u32 length + UTF-8 JSON of the small sections (profile, tasks, logs, ...)
+#   string table: u32 count, then u32 length + UTF-8 bytes per string
+#   per bulk section: u32 count, then fixed-width records (struct below)
+# Ids, task ids, dates, categories and notes are indexes into the string
+# table; timestamps are epoch seconds, so nothing needs parsing on load.
+
+MAGIC = b"GMCB"
+VERSION = 1
+
+NO_STRING = 0xFFFFFFFF
+NO_TIME = -(2 ** 63)
+
+SESSION = struct.Struct("<IIqqq")      # id, task_id, start, end, duration
+COMPLETION = struct.Struct("<III")     # id, task_id, date
+TRANSACTION = struct.Struct("<IqdII")  # id, timestamp, amount, category, description
+AMCA = struct.Struct("<IqqI")          # id, timestamp, xp_reward, note
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+
+def is_binary(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class _Strings:
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def dumps(state: AppState) -> bytes:
+    enc = codec.ENCODERS
+    small = {
+        "profile": enc[Profile](state.profile),
+        "stats": {k: enc[Stat](v) for k, v in state.stats.items()},
+        "tasks": {k: enc[TaskTemplate](v) for k, v in state.tasks.items()},
+        "book_projects": {k: enc[BookProject](v) for k, v in state.book_projects.items()},
+        "material_goals": {k: enc[MaterialGoal](v) for k, v in state.material_goals.items()},
+        "daily_logs": {k: enc[DailyRoutineLog](v) for k, v in state.daily_logs.items()},
+        "settings": enc[Settings](state.settings),
+        "rollups": {k: enc[DayRollup](v) for k, v in state.rollups.items()},
+        "balance": state.wallet.balance,
+    }
+
+    s = _Strings()
+    sessions = b"".join(
+        SESSION.pack(s.code(x.id), s.code(x.task_id), x.start_time,
+                     NO_TIME if x.end_time is None else x.end_time, x.duration_seconds)
+        for x in state.sessions.values()
+    )
+    completions = b"".join(
+        COMPLETION.pack(s.code(c.id), s.code(c.task_id), s.code(c.date))
+        for c in state.task_completions
+    )
+    transactions = b"".join(
+        TRANSACTION.pack(s.code(t.id), t.timestamp, t.amount, s.code(t.category), s.code(t.description))
+        for t in state.wallet.transactions
+    )
+    amca = b"".join(
+        AMCA.pack(s.code(a.id), a.timestamp, a.xp_reward, s.code(a.note))
+        for a in state.amca_actions
+    )
+
+    header = json.dumps(small, ensure_ascii=False).encode('utf-8')
+    parts = [MAGIC, _U16.pack(VERSION), _U32.pack(len(header)), header, _U32.pack(len(s.values))]
+    for value in s.values:
+        raw = value.encode('utf-8')
+        parts += [_U32.pack(len(raw)), raw]
+    for count, blob in (
+        (len(state.sessions), sessions), (len(state.task_completions), completions),
+        (len(state.wallet.transactions), transactions), (len(state.amca_actions), amca),
+    ):
+        parts += [_U32.pack(count), blob]
+    return b"".join(parts)
+
+
+def _read_u32(data: memoryview, pos: int) -> Tuple[int, int]:
+    return _U32.unpack_from(data, pos)[0], pos + 4
+
+
+def loads(raw: bytes) -> AppState:
+    if raw[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary state file")
+    data = memoryview(raw)
+    pos = len(MAGIC)
+    version = _U16.unpack_from(data, pos)[0]
+    if version != VERSION:
+        raise ValueError(f"unsupported binary state version {version}")
+    pos += 2
+
+    size, pos = _read_u32(data, pos)
+    small = json.loads(bytes(data[pos:pos + size]).decode('utf-8'))
+    pos += size
+
+    count, pos = _read_u32(data, pos)
+    strings: List[Optional[str]] = []
+    for _ in range(count):
+        size, pos = _read_u32(data, pos)
+        strings.append(sys.intern(bytes(data[pos:pos + size]).decode('utf-8')))
+        pos += size
+
+    def section(layout: struct.Struct):
+        nonlocal pos
+        n, pos = _read_u32(data, pos)
+        end = pos + n * layout.size
+        rows = layout.iter_unpack(data[pos:end])
+        pos = end
+        return rows
+
+    def text(code: int) -> Optional[str]:
+        return None if code == NO_STRING else strings[code]
+
+    sessions = {}
+    for sid, tid, start, end, duration in section(SESSION):
+        sessions[strings[sid]] = TimerSession(
+            strings[sid], strings[tid], start, duration, None if end == NO_TIME else end
+        )
+    completions = [TaskCompletion(strings[i], strings[t], strings[d]) for i, t, d in section(COMPLETION)]
+    transactions = [
+        Transaction(strings[i], ts, amount, strings[cat], text(desc))
+        for i, ts, amount, cat, desc in section(TRANSACTION)
+    ]
+    amca = [AmcaAction(strings[i], ts, xp, text(note)) for i, ts, xp, note in section(AMCA)]
+
+    dec = codec.DECODERS
+    return AppState(
+        profile=dec[Profile](small["profile"]),
+        stats={k: dec[Stat](v) for k, v in small["stats"].items()},
+        tasks={k: dec[TaskTemplate](v) for k, v in small["tasks"].items()},
+        sessions=sessions,
+        amca_actions=amca,
+        wallet=Wallet(balance=small["balance"], transactions=transactions),
+        book_projects={k: dec[BookProject](v) for k, v in small["book_projects"].items()},
+        material_goals={k: dec[MaterialGoal](v) for k, v in small["material_goals"].items()},
+        daily_logs={k: dec[DailyRoutineLog](v) for k, v in small["daily_logs"].items()},
+        settings=dec[Settings](small["settings"]),
+        task_completions=completions,
+        rollups={k: dec[DayRollup](v) for k, v in small.get("rollups", {}).items()},
+    )
+
+
+def main(argv: List[str]) -> None:
+    # Conversion goes through storage so archives and journals are included
+    if len(argv) != 4 or argv[1] not in ("to-binary", "to-json"):
+        print("Usage: python binfmt.py to-binary|to-json <source> <target>")
+        return
+    import storage
+    storage.convert_state(argv[2], argv[3], "binary" if argv[1] == "to-binary" else "json")
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,126 @@
+import dataclasses
+import sys
+from datetime import date
+from typing import Any, Callable, Dict
+
+from models import (
+    AppState, Profile, Stat, TaskTemplate, TimerSession,
+    AmcaAction, Wallet, Transaction, BookProject,
+    DailyRoutineLog, MaterialGoal, Settings, TaskCompletion, DayRollup,
+    TIMESTAMP_FIELDS, ts_to_iso, iso_to_ts
+)
+
+# Per-model encoders/decoders generated once from the dataclass fields.
+# Encoders read attributes straight into a JSON-ready dict (no recursive
+# deep copy like dataclasses.asdict); decoders call the constructor with
+# positional arguments and fill in defaults for fields older files lack.
+
+RECORD_MODELS = (
+    Stat, Profile, TaskTemplate, TaskCompletion, TimerSession, AmcaAction,
+    Transaction, BookProject, DailyRoutineLog, MaterialGoal, Settings, DayRollup
+)
+
+# Defaults that differ from the model's when a field is missing on disk
+LEGACY_DEFAULTS = {
+    (TaskTemplate, "created_date"): "date.today().isoformat()",
+}
+
+ENCODERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+DECODERS: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+
+def _generate(cls: type) -> None:
+    stamps = TIMESTAMP_FIELDS.get(cls, ())
+    namespace = {
+        "cls": cls, "ts_to_iso": ts_to_iso, "iso_to_ts": iso_to_ts,
+        "intern": sys.intern, "date": date, "MISSING": dataclasses.MISSING,
+    }
+    enc_items = []
+    dec_args = []
+    for i, f in enumerate(dataclasses.fields(cls)):
+        value = f"obj.{f.name}"
+        if f.name in stamps:
+            value = f"(None if {value} is None else ts_to_iso({value}))"
+        enc_items.append(f"{f.name!r}: {value}")
+
+        if (cls, f.name) in LEGACY_DEFAULTS:
+            fallback = LEGACY_DEFAULTS[(cls, f.name)]
+        elif f.default is not dataclasses.MISSING:
+            namespace[f"default_{i}"] = f.default
+            fallback = f"default_{i}"
+        elif f.default_factory is not dataclasses.MISSING:
+            namespace[f"factory_{i}"] = f.default_factory
+            fallback = f"factory_{i}()"
+        else:
+            fallback = None
+        raw = f"d[{f.name!r}]" if fallback is None else \
+            f"(d[{f.name!r}] if {f.name!r} in d else {fallback})"
+        if f.name in stamps:
+            raw = f"(None if (v := {raw}) is None else iso_to_ts(v))"
+        elif f.name == "task_id":
+            # Many records point at few tasks; share the strings
+            raw = f"intern({raw})"
+        dec_args.append(raw)
+
+    source = (
+        f"def encode(obj):\n    return {{{', '.join(enc_items)}}}\n"
+        f"def decode(d):\n    return cls({', '.join(dec_args)})\n"
+    )
+    exec(compile(source, f"<codec {cls.__name__}>", "exec"), namespace)
+    ENCODERS[cls] = namespace["encode"]
+    DECODERS[cls] = namespace["decode"]
+
+for _cls in RECORD_MODELS:
+    _generate(_cls)
+
+def encode(record: Any) -> Dict[str, Any]:
+    return ENCODERS[type(record)](record)
+
+def decode(cls: type, data: Dict[str, Any]) -> Any:
+    return DECODERS[cls](data)
+
+def encode_state(state: AppState) -> Dict[str, Any]:
+    enc = ENCODERS
+    stat, task, session = enc[Stat], enc[TaskTemplate], enc[TimerSession]
+    book, goal, log = enc[BookProject], enc[MaterialGoal], enc[DailyRoutineLog]
+    rollup = enc[DayRollup]
+    return {
+        "profile": enc[Profile](state.profile),
+        "stats": {k: stat(v) for k, v in state.stats.items()},
+        "tasks": {k: task(v) for k, v in state.tasks.items()},
+        "sessions": {k: session(v) for k, v in state.sessions.items()},
+        "amca_actions": list(map(enc[AmcaAction], state.amca_actions)),
+        "wallet": {
+            "balance": state.wallet.balance,
+            "transactions": list(map(enc[Transaction], state.wallet.transactions)),
+        },
+        "book_projects": {k: book(v) for k, v in state.book_projects.items()},
+        "material_goals": {k: goal(v) for k, v in state.material_goals.items()},
+        "daily_logs": {k: log(v) for k, v in state.daily_logs.items()},
+        "settings": enc[Settings](state.settings),
+        "task_completions": list(map(enc[TaskCompletion], state.task_completions)),
+        "rollups": {k: rollup(v) for k, v in state.rollups.items()},
+    }
+
+def decode_state(data: Dict[str, Any]) -> AppState:
+    dec = DECODERS
+    stat, task, session = dec[Stat], dec[TaskTemplate], dec[TimerSession]
+    book, goal, log = dec[BookProject], dec[MaterialGoal], dec[DailyRoutineLog]
+    rollup = dec[DayRollup]
+    wallet_data = data.get("wallet", {})
+    return AppState(
+        profile=dec[Profile](data.get("profile", {})),
+        stats={k: stat(v) for k, v in data.get("stats", {}).items()},
+        tasks={k: task(v) for k, v in data.get("tasks", {}).items()},
+        sessions={k: session(v) for k, v in data.get("sessions", {}).items()},
+        amca_actions=list(map(dec[AmcaAction], data.get("amca_actions", []))),
+        wallet=Wallet(
+            balance=wallet_data.get("balance", 0.0),
+            transactions=list(map(dec[Transaction], wallet_data.get("transactions", [])))
+        ),
+        book_projects={k: book(v) for k, v in data.get("book_projects", {}).items()},
+        material_goals={k: goal(v) for k, v in data.get("material_goals", {}).items()},
+        daily_logs={k: log(v) for k, v in data.get("daily_logs", {}).items()},
+        settings=dec[Settings](data.get("settings", {})),
+        task_completions=list(map(dec[TaskCompletion], data.get("task_completions", []))),
+        rollups={k: rollup(v) for k, v in data.get("rollups", {}).items()},
+    )
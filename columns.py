@@ -0,0 +1,102 @@
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import accumulate
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import Transaction
+
+# Column-oriented copies of wallet transactions. Each column is a typed
+# array (8 bytes per value instead of a boxed float per record), so the
+# income and balance queries in logic.py run as range sums over running
+# totals instead of walking record objects.
+
+
+class Ledger:
+    """Amounts ordered by timestamp with running totals, for O(log n) range sums."""
+
+    def __init__(self):
+        self.timestamp = array('q')
+        self.amount = array('d')
+        self.running = array('d')  # running[i] == sum(amount[:i + 1])
+        # Out-of-order arrivals (imports, archive merges, batches), merged on the next read
+        self.pending: List[Tuple[int, float]] = []
+
+    def __len__(self) -> int:
+        return len(self.timestamp) + len(self.pending)
+
+    def append(self, ts: int, amount: float) -> None:
+        if self.pending or (self.timestamp and ts < self.timestamp[-1]):
+            self.pending.append((ts, amount))
+            return
+        self.timestamp.append(ts)
+        self.amount.append(amount)
+        self.running.append((self.running[-1] if self.running else 0.0) + amount)
+
+    def settle(self) -> None:
+        """Sorts pending rows in and recomputes the running totals, once per burst."""
+        if not self.pending:
+            return
+        # Stable: a late row lands after existing rows with the same timestamp
+        rows = sorted([*zip(self.timestamp, self.amount), *self.pending], key=itemgetter(0))
+        self.pending = []
+        self.timestamp = array('q', [ts for ts, _ in rows])
+        self.amount = array('d', [amount for _, amount in rows])
+        self.running = array('d', accumulate(self.amount))
+
+    def total(self) -> float:
+        self.settle()
+        return self.running[-1] if self.running else 0.0
+
+    def total_before(self, ts: int) -> float:
+        self.settle()
+        i = bisect_left(self.timestamp, ts)
+        return self.running[i - 1] if i else 0.0
+
+    def total_between(self, lo: int, hi: int) -> float:
+        return self.total_before(hi) - self.total_before(lo)
+
+
+class TransactionLedger:
+    """Wallet transactions indexed by time, per category and per month."""
+
+    def __init__(self):
+        self.all = Ledger()
+        self.by_category: Dict[str, Ledger] = {}
+        self.monthly: Dict[str, Dict[str, float]] = {}  # "YYYY-MM" -> category -> net amount
+
+    def __len__(self) -> int:
+        return len(self.all)
+
+    def append(self, txn: Transaction) -> None:
+        self.all.append(txn.timestamp, txn.amount)
+        ledger = self.by_category.get(txn.category)
+        if ledger is None:
+            ledger = self.by_category[txn.category] = Ledger()
+        ledger.append(txn.timestamp, txn.amount)
+        month = self.monthly.setdefault(datetime.fromtimestamp(txn.timestamp).strftime("%Y-%m"), {})
+        month[txn.category] = month.get(txn.category, 0.0) + txn.amount
+
+    def extend(self, txns: Iterable[Transaction]) -> None:
+        for txn in txns:
+            self.append(txn)
+
+    def settle(self) -> None:
+        self.all.settle()
+        for ledger in self.by_category.values():
+            ledger.settle()
+
+    def total_between(self, lo: int, hi: int, category: Optional[str] = None) -> float:
+        if category is None:
+            return self.all.total_between(lo, hi)
+        ledger = self.by_category.get(category)
+        return ledger.total_between(lo, hi) if ledger else 0.0
+
+    def balance_before(self, balance_now: float, ts: int) -> float:
+        """Wallet balance just before ts, given the current balance."""
+        return balance_now - (self.all.total() - self.all.total_before(ts))
+
+    def month_total(self, month: str, category: Optional[str] = None) -> float:
+        totals = self.monthly.get(month, {})
+        return sum(totals.values()) if category is None else totals.get(category, 0.0)
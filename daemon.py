@@ -0,0 +1,391 @@
+import argparse
+import dataclasses
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from collections import deque
+from datetime import date
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+import codec
+import logic
+import perf
+import storage
+from models import AppState, Wallet
+from saver import BackgroundSaver
+
+# Headless owner of the AppState. Clients talk newline-delimited JSON over
+# a Unix domain socket next to the state file ("<name>.sock"):
+#   {"op": "call", "fn": "add_amca_action", "args": [10], "kwargs": {}, "since": 41}
+#   {"op": "snapshot", "sections": ["tasks"]} / {"op": "sync", "since": 41} / {"op": "ping"}
+# The logic functions named in CALLABLE can be called by name with the state supplied
+# by the daemon. Responses carry the result plus, when "since" is given, the
+# change events after that sequence number so client mirrors stay current.
+# Persistence is the same debounced journal writer the GUI uses.
+
+EVENT_BACKLOG = 10_000
+
+# What clients may call: the batchable mutators, the mutations that run as
+# a whole (batches, imports, streak upkeep) and read-only queries. Names are
+# looked up on logic per call, so perf instrumentation installed later applies.
+CALLABLE: FrozenSet[str] = frozenset(logic.BATCH_OPERATIONS) | {fn.__name__ for fn in (
+    logic.apply_batch, logic.import_records, logic.backfill_streaks, logic.update_streak_for_date,
+    logic.get_schedule_report, logic.get_tasks_for_date, logic.get_task_minutes_for_date,
+    logic.is_task_completed_for_date, logic.get_active_session, logic.get_all_active_sessions,
+    logic.get_income_between, logic.get_month_income, logic.get_income_progress,
+    logic.get_balance_on, logic.get_monthly_totals,
+)}
+
+MODELS = {cls.__name__: cls for cls in codec.RECORD_MODELS}
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+def socket_path(state_path: str = storage.DEFAULT_STATE_FILE) -> str:
+    return os.path.splitext(os.path.abspath(state_path))[0] + ".sock"
+
+# --- Wire values ---
+# Dates and model records are tagged; everything else is plain JSON.
+
+def encode_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if type(value) in codec.ENCODERS:
+        return {"$model": type(value).__name__, "v": codec.encode(value)}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    raise TypeError(f"cannot send a {type(value).__name__} over the daemon socket")
+
+def decode_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    if isinstance(value, dict):
+        if "$date" in value:
+            return date.fromisoformat(value["$date"])
+        if "$model" in value:
+            return codec.decode(MODELS[value["$model"]], value["v"])
+        return {k: decode_value(v) for k, v in value.items()}
+    return value
+
+def only_sections(state: AppState, sections: Iterable[str]) -> AppState:
+    """Shallow copy of state with every other collection left empty."""
+    wanted = set(sections)
+    blank = {
+        f.name: type(getattr(state, f.name))() for f in dataclasses.fields(AppState)
+        if f.name in storage.SECTION_MODELS and f.name not in wanted
+        and isinstance(getattr(state, f.name), (dict, list))
+    }
+    if "wallet" not in wanted:
+        blank["wallet"] = Wallet(balance=state.wallet.balance)
+    return dataclasses.replace(state, **blank)
+
+# --- Server ---
+
+def listen(sock: str) -> socket.socket:
+    """A listening Unix socket only its owner can connect to.
+
+    The file is created under a 0177 umask, so it is never reachable with
+    looser permissions, not even between bind and a later chmod.
+    """
+    if os.path.exists(sock):
+        os.remove(sock)  # left over from a crash; main() checked it is dead
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(sock)
+    finally:
+        os.umask(old_umask)
+    listener.listen()
+    return listener
+
+class StateDaemon:
+    """Owns the state and serves it to clients.
+
+    Requests are handled one at a time, in arrival order, on a single
+    worker thread (see handle), so the event loop keeps reading and
+    answering connections while a call or a snapshot runs.
+    """
+
+    def __init__(self, path: str = storage.DEFAULT_STATE_FILE, sock: Optional[str] = None):
+        self.path = path
+        self.socket = sock or socket_path(path)
+        # Bound before the saver thread exists, as the umask is process-wide
+        self.listener = listen(self.socket)
+        self.state = storage.load_state(path)
+        self.saver = BackgroundSaver(self.state, path)
+        self.saver.mutate(logic.backfill_streaks, date.today())
+        self.seq = 0
+        self.events: deque = deque(maxlen=EVENT_BACKLOG)  # (seq, event)
+
+    def call(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        fn = getattr(logic, name) if name in CALLABLE else None
+        if fn is None:
+            raise DaemonError(f"unknown function {name!r}")
+        changes = self.state.changes
+        with self.saver.lock:
+            changes.recording = {}
+            try:
+                result = fn(self.state, *decode_value(args), **decode_value(kwargs))
+            finally:
+                # Published even if fn failed part-way, so mirrors match the state
+                recorded, changes.recording = changes.recording, None
+                self.publish(storage.encode_events(recorded))
+        return encode_value(result)
+
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            self.seq += 1
+            self.events.append((self.seq, event))
+        if events:
+            self.saver.mark_dirty()
+
+    def events_since(self, since: int) -> Dict[str, Any]:
+        if self.events and since < self.events[0][0] - 1:
+            return {"seq": self.seq, "resync": True}
+        return {"seq": self.seq, "events": [e for n, e in self.events if n > since]}
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        try:
+            if op == "call":
+                response = {"ok": True, "result": self.call(
+                    request["fn"], request.get("args", []), request.get("kwargs", {})
+                )}
+            elif op == "snapshot":
+                sections = request.get("sections")
+                with self.saver.lock:
+                    state = self.state if sections is None else only_sections(self.state, sections)
+                    response = {"ok": True, "state": codec.encode_state(state), "seq": self.seq}
+                return response
+            elif op in ("sync", "ping"):
+                response = {"ok": True}
+            else:
+                raise DaemonError(f"unknown op {op!r}")
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if "since" in request:
+            response.update(self.events_since(request["since"]))
+        return response
+
+    async def handle(self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter") -> None:
+        import asyncio
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await loop.run_in_executor(self.executor, self.dispatch, json.loads(line))
+                except json.JSONDecodeError as e:
+                    response = {"ok": False, "error": f"bad request: {e}"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        # One worker: calls and snapshots are serialized, mirrors see one order
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daemon-dispatch")
+        server = await asyncio.start_unix_server(self.handle, sock=self.listener, limit=64 * 1024 * 1024)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        print(f"Serving {self.path} on {self.socket}")
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if os.path.exists(self.socket):
+                os.remove(self.socket)
+            self.executor.shutdown(wait=True)
+            self.saver.stop()
+            print("Daemon stopped, state saved.")
+
+# --- Client ---
+
+def is_running(sock: str) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(sock)
+        return True
+    except OSError:
+        return False
+
+def check_response(response: Dict[str, Any]) -> None:
+    if not response.get("ok"):
+        raise DaemonError(response.get("error", "request failed"))
+
+class DaemonClient:
+    """Blocking client; one request at a time over a single connection."""
+
+    def __init__(self, sock: str):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(sock)
+        self.file = self.sock.makefile('rwb')
+        self.lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, state_path: str = storage.DEFAULT_STATE_FILE) -> Optional["DaemonClient"]:
+        """Client for the daemon serving state_path, or None if none is running."""
+        try:
+            return cls(socket_path(state_path))
+        except OSError:
+            return None
+
+    def request(self, payload: Dict[str, Any], check: bool = True) -> Dict[str, Any]:
+        with self.lock:
+            self.file.write(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b"\n")
+            self.file.flush()
+            line = self.file.readline()
+        if not line:
+            raise DaemonError("daemon closed the connection")
+        response = json.loads(line)
+        if check:
+            check_response(response)
+        return response
+
+    def call(self, name: str, *args, **kwargs) -> Any:
+        response = self.request({"op": "call", "fn": name, "args": encode_value(args), "kwargs": encode_value(kwargs)})
+        return decode_value(response["result"])
+
+    def close(self) -> None:
+        self.file.close()
+        self.sock.close()
+
+
+class RemoteSaver:
+    """BackgroundSaver stand-in for clients attached to the daemon.
+
+    `state` is a local mirror used for reads; mutate() runs the function in
+    the daemon and applies the resulting change events (and any made by
+    other clients since the last request) to the mirror.
+    """
+
+    def __init__(
+        self, client: DaemonClient, on_write: Optional[Callable[[], None]] = None,
+        sections: Optional[Iterable[str]] = None
+    ):
+        self.client = client
+        self.on_write = on_write
+        # Mirror only these AppState fields (see storage.load_state)
+        self.sections = None if sections is None else frozenset(sections)
+        self.lock = threading.RLock()
+        self.writes = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+        self.state: AppState = None
+        self.seq = 0
+        self.resync()
+
+    def resync(self) -> None:
+        request = {"op": "snapshot"}
+        if self.sections is not None:
+            request["sections"] = sorted(self.sections)
+        response = self.client.request(request)
+        state = storage.dict_to_appstate(response["state"])
+        state.changes.clear()
+        state.sections = self.sections
+        if self.state is None:
+            self.state = state
+        else:
+            # Keep the object callers hold; swap its contents
+            for name in ("profile", "stats", "tasks", "sessions", "amca_actions", "wallet", "book_projects",
+                         "material_goals", "daily_logs", "settings", "task_completions", "rollups"):
+                setattr(self.state, name, getattr(state, name))
+            self.state.index = None
+        self.seq = response["seq"]
+
+    def _apply(self, response: Dict[str, Any]) -> bool:
+        if response.get("resync"):
+            self.resync()
+            return True
+        events = response.get("events", [])
+        with self.lock:
+            storage.apply_state_events(self.state, events)
+        self.seq = response.get("seq", self.seq)
+        return bool(events)
+
+    def mutate(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        started = time.perf_counter()
+        response = self.client.request({
+            "op": "call", "fn": fn.__name__, "args": encode_value(args),
+            "kwargs": encode_value(kwargs), "since": self.seq,
+        }, check=False)
+        # A failed call may still have changed the state part-way
+        self._apply(response)
+        check_response(response)
+        latency = time.perf_counter() - started
+        self.writes += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._total_latency += latency
+        if self.on_write:
+            self.on_write()
+        return decode_value(response["result"])
+
+    def sync(self) -> bool:
+        """Pulls changes made by other clients; True if the mirror changed."""
+        return self._apply(self.client.request({"op": "sync", "since": self.seq}))
+
+    def mark_dirty(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        self.client.close()
+
+    @property
+    def pending(self) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": 0,
+            "writes": self.writes,
+            "errors": 0,
+            "last_latency_ms": self.last_latency * 1000,
+            "avg_latency_ms": (self._total_latency / self.writes * 1000) if self.writes else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the app state to CLI and GUI clients.")
+    parser.add_argument("state", nargs="?", default=storage.DEFAULT_STATE_FILE)
+    parser.add_argument("--socket", help="socket path (default: next to the state file)")
+    parser.add_argument("--perf", action="store_true", help="record call timings")
+    args = parser.parse_args()
+    if args.perf:
+        perf.enable()
+    perf.install()
+    sock = args.socket or socket_path(args.state)
+    if is_running(sock):
+        print(f"A daemon is already listening on {sock}")
+        return
+    # Imported here: clients (every CLI command) don't pay for asyncio
+    import asyncio
+    daemon = StateDaemon(args.state, sock)
+    asyncio.run(daemon.serve())
+    if perf.enabled():
+        print(perf.report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from models import AppState, TimerSession, TaskCompletion, Transaction, now_ts
+from columns import TransactionLedger
+
+# Derived lookup structures kept next to AppState (state.index) so the
+# per-second UI paths never scan the full history. They are rebuilt from
+# the records on load and kept current by the mutators in logic.py.
+
+TaskDay = Tuple[str, str]  # (task_id, "YYYY-MM-DD")
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def session_day(session: TimerSession) -> str:
+    return date.fromtimestamp(session.start_time).isoformat()
+
+def epoch_day(day: date) -> int:
+    return day.toordinal() - EPOCH_ORDINAL
+
+def ts_epoch_day(ts: int) -> int:
+    return epoch_day(date.fromtimestamp(ts))
+
+
+class StateIndex:
+    def __init__(self):
+        self.closed_seconds: Dict[TaskDay, int] = {}
+        # Registry of open sessions by task_id
+        self.active: Dict[str, TimerSession] = {}
+        self.completed: Set[TaskDay] = set()
+        # Streak activity: bit n set when a session ended on epoch day
+        # timer_base + n; the base moves down for days before it
+        self.timer_days = 0
+        self.timer_base = 0
+
+        self.transactions = TransactionLedger()
+
+    @classmethod
+    def build(cls, state: AppState) -> "StateIndex":
+        index = cls()
+        for session in state.sessions.values():
+            if session.end_time is None:
+                index.active[session.task_id] = session
+            else:
+                index._closed(session)
+        index.transactions.extend(state.wallet.transactions)
+        for completion in state.task_completions:
+            index.completion_added(completion)
+        return index
+
+    # --- Sessions ---
+
+    def session_started(self, session: TimerSession) -> None:
+        self.active[session.task_id] = session
+
+    def session_stopped(self, session: TimerSession) -> None:
+        if self.active.get(session.task_id) is session:
+            del self.active[session.task_id]
+        self._closed(session)
+
+    def session_recorded(self, session: TimerSession) -> None:
+        """A session added already finished (see logic.record_session)."""
+        self._closed(session)
+
+    def _closed(self, session: TimerSession) -> None:
+        key = (session.task_id, session_day(session))
+        self.closed_seconds[key] = self.closed_seconds.get(key, 0) + session.duration_seconds
+        day = ts_epoch_day(session.end_time)
+        if day < self.timer_base:
+            self.timer_days <<= self.timer_base - day
+            self.timer_base = day
+        self.timer_days |= 1 << (day - self.timer_base)
+
+    def active_session(self, task_id: str) -> Optional[TimerSession]:
+        return self.active.get(task_id)
+
+    def active_sessions(self) -> List[TimerSession]:
+        return list(self.active.values())
+
+    # --- Wallet ---
+
+    def transaction_added(self, txn: Transaction) -> None:
+        self.transactions.append(txn)
+
+    def settle(self) -> None:
+        """Finishes upkeep that appends leave for later (out-of-order ledger rows)."""
+        self.transactions.settle()
+
+    # --- Streak activity ---
+
+    def timer_mask(self, start: date, days: int) -> int:
+        """Bit i set when a timer finished on start + i days."""
+        first = epoch_day(start) - self.timer_base
+        bits = self.timer_days >> first if first >= 0 else self.timer_days << -first
+        return bits & ((1 << days) - 1)
+
+    # --- Completions ---
+
+    def completion_added(self, completion: TaskCompletion) -> None:
+        self.completed.add((completion.task_id, completion.date))
+
+    def is_completed(self, task_id: str, day: str) -> bool:
+        return (task_id, day) in self.completed
+
+    def task_seconds(self, task_id: str, day: str, now: Optional[int] = None) -> int:
+        total = self.closed_seconds.get((task_id, day), 0)
+        session = self.active.get(task_id)
+        if session and session_day(session) == day:
+            total += session.duration_seconds
+            total += (now_ts() if now is None else now) - session.start_time
+        return total
@@ -0,0 +1,55 @@
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+# Crash safety for the append-only JSON Lines files (the JSON journal and
+# section_store's logs). A crash mid-append can leave a partial last line;
+# writers cut it off before appending so the next record isn't glued onto
+# it, and readers skip any line that doesn't parse instead of stopping.
+
+BLOCK = 4096
+
+def repair_tail(file_path: str) -> None:
+    """Truncates a partial last line, so an append starts on a fresh line."""
+    if not os.path.exists(file_path):
+        return
+    with open(file_path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = end
+        while pos > 0:
+            start = max(0, pos - BLOCK)
+            f.seek(start)
+            cut = f.read(pos - start).rfind(b"\n")
+            if cut != -1:
+                f.truncate(start + cut + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+def parse_lines(
+    lines: Iterable[bytes], source: str, keep: Optional[Callable[[str], bool]] = None
+) -> Iterator[Dict[str, Any]]:
+    """The JSON objects on lines; keep can skip a line before it is parsed.
+
+    A line that isn't a JSON object (torn by a crash) is reported and
+    skipped, so the records after it still load.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            text = line.decode('utf-8')
+            if keep is not None and not keep(text):
+                continue
+            record = json.loads(text)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            record = None
+        if isinstance(record, dict):
+            yield record
+        else:
+            print(f"Skipping unreadable line {number} of {source}")
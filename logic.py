@@ -1,11 +1,72 @@
+import inspect
 import uuid
 from datetime import datetime, date, timedelta
-from typing import Optional, List
+from typing import Any, Callable, Iterable, Optional, List, Dict, Set, Tuple
 
 from models import (
     AppState, Profile, TaskTemplate, TimerSession, 
-    AmcaAction, DailyRoutineLog, Transaction, TaskCompletion, BookProject, Stat
+    AmcaAction, DailyRoutineLog, Transaction, TaskCompletion, BookProject, Stat, DayRollup,
+    now_ts, day_bounds
 )
+from indexes import StateIndex
+import schedule
+import archive
+import rollups
+
+def get_index(state: AppState) -> StateIndex:
+    # States built outside storage.load_state get their index on first use
+    if state.index is None:
+        state.index = StateIndex.build(state)
+    return state.index
+
+def ensure_history(state: AppState, start: date, end: date) -> None:
+    """Loads archived history for [start, end]; a no-op if it is already in memory."""
+    ensure_months(state, archive.months_between(start, end))
+
+def ensure_months(state: AppState, months: Iterable[str]) -> None:
+    """Loads the given archived months ("YYYY-MM") in one go."""
+    info = state.archive
+    if info is None or info.loader is None:
+        return
+    missing = (set(months) & info.available) - info.loaded
+    if missing:
+        info.loader(state, missing)
+
+def get_rollups(state: AppState) -> Dict[str, DayRollup]:
+    """Per-day rollups; files written before they existed get them built once
+    from the full history (which loads every archived month)."""
+    if not state.rollups:
+        info = state.archive
+        if (info and info.available - info.loaded) or \
+                any(s.end_time is not None for s in state.sessions.values()):
+            rebuild_rollups(state)
+    return state.rollups
+
+def rebuild_rollups(state: AppState) -> None:
+    info = state.archive
+    if info and info.loader:
+        info.loader(state, info.available - info.loaded)
+    built: Dict[str, DayRollup] = {}
+    for session in state.sessions.values():
+        if session.end_time is not None:
+            category, stat_name = _rollup_keys(state, session.task_id)
+            rollups.add_session(built, session, category, stat_name)
+    state.rollups = dict(sorted(built.items()))
+    for day, roll in state.rollups.items():
+        state.changes.touch("rollups", day, roll)
+
+def _rollup_keys(state: AppState, task_id: str) -> Tuple[Optional[str], Optional[str]]:
+    # Same rule as Stat.total_seconds: only stats that exist are credited
+    task = state.tasks.get(task_id)
+    if task is None:
+        return None, None
+    return task.category, task.stat_name if task.stat_name in state.stats else None
+
+def get_time_series(state: AppState, kind: str, key: str, start: date, end: date) -> rollups.Series:
+    """Daily seconds for a stat/category/task ("stats", "categories", "tasks")."""
+    return rollups.series(get_rollups(state), kind, key, start, end)
+
+INCOME_CATEGORY = "Income Adjustment"
 
 # --- Leveling Logic ---
 LEVEL_NAMES = [
@@ -31,6 +92,7 @@ def update_profile_general(state: AppState, username: str, xp: int, streak: int,
     state.profile.streak_freezes = freezes
     # Recalculate level based on new XP
     recalc_level_from_xp(state.profile)
+    state.changes.touch("profile", record=state.profile)
 
 def update_stat_level(state: AppState, stat_name: str, new_level: int) -> None:
     if stat_name not in state.stats:
@@ -41,6 +103,7 @@ def update_stat_level(state: AppState, stat_name: str, new_level: int) -> None:
     target_seconds = (new_level - 1) * 36000
     if target_seconds < 0: target_seconds = 0
     state.stats[stat_name].total_seconds = target_seconds
+    state.changes.touch("stats", stat_name, state.stats[stat_name])
 
 # --- Task Definition ---
 def add_task_definition(
@@ -69,71 +132,97 @@ def add_task_definition(
         custom_weekdays=custom_weekdays
     )
     state.tasks[new_id] = task
+    state.changes.touch("tasks", new_id, task)
     return task
 
+def update_task_definition(
+    state: AppState, task_id: str, title: str, description: str, category: str,
+    recurrence: str, target_minutes: Optional[int], xp_reward: int,
+    point_reward: int, stat_name: Optional[str],
+    custom_every_n_days: Optional[int] = None,
+    custom_weekdays: Optional[List[int]] = None
+) -> Optional[TaskTemplate]:
+    task = state.tasks.get(task_id)
+    if not task: return None
+
+    task.title = title
+    task.description = description
+    task.category = category
+    task.recurrence = recurrence
+    task.target_minutes = target_minutes
+    task.xp_reward = xp_reward
+    task.point_reward = point_reward
+    task.stat_name = stat_name
+    task.custom_every_n_days = custom_every_n_days
+    task.custom_weekdays = custom_weekdays
+    state.changes.touch("tasks", task_id, task)
+    return task
+
+def delete_task_definition(state: AppState, task_id: str) -> None:
+    if task_id in state.tasks:
+        del state.tasks[task_id]
+        state.changes.touch("tasks", task_id, None)
+
 # --- Recurrence & Schedule Logic ---
 
 def is_task_scheduled_for_date(task: TaskTemplate, target_date: date) -> bool:
-    created_dt = date.fromisoformat(task.created_date)
-    
-    if task.recurrence == "once":
-        return created_dt == target_date
-    elif task.recurrence == "daily":
-        return target_date >= created_dt
-    elif task.recurrence == "weekly":
-        return target_date >= created_dt and target_date.weekday() == created_dt.weekday()
-    elif task.recurrence == "monthly":
-        return target_date >= created_dt and target_date.day == created_dt.day
-    elif task.recurrence == "custom":
-        if task.custom_every_n_days:
-            diff = (target_date - created_dt).days
-            return target_date >= created_dt and (diff % task.custom_every_n_days == 0)
-        elif task.custom_weekdays:
-            return target_date >= created_dt and (target_date.weekday() in task.custom_weekdays)
-    return False
+    return schedule.task_mask(task, target_date, 1) == 1
+
+def get_schedule(state: AppState, start: date, end: date) -> schedule.ScheduleMatrix:
+    return schedule.expand(state.tasks.values(), start, end)
+
+def get_schedule_report(state: AppState, start: date, end: date) -> Dict[str, Tuple[int, int]]:
+    """task_id -> (scheduled occurrences, occurrences with a recorded completion)."""
+    ensure_history(state, start, end)
+    matrix = get_schedule(state, start, end)
+    done: Dict[str, List[date]] = {}
+    for task_id, day in get_index(state).completed:
+        if task_id in matrix.rows:
+            done.setdefault(task_id, []).append(schedule.parse_day(day))
+
+    report = {}
+    for task_id, mask in matrix.rows.items():
+        hit = mask & matrix.day_mask(done.get(task_id, ()))
+        report[task_id] = (mask.bit_count(), hit.bit_count())
+    return report
 
 def get_task_minutes_for_date(state: AppState, task_id: str, target_date: date) -> int:
-    total_seconds = 0
-    for s in state.sessions.values():
-        if s.task_id == task_id:
-            s_date = datetime.fromisoformat(s.start_time).date()
-            if s_date == target_date:
-                total_seconds += s.duration_seconds
-                if s.end_time is None:
-                    start_dt = datetime.fromisoformat(s.start_time)
-                    active_sec = (datetime.now() - start_dt).total_seconds()
-                    total_seconds += active_sec
+    total_seconds = get_index(state).task_seconds(task_id, target_date.isoformat())
     return int(total_seconds // 60)
 
 def is_task_completed_for_date(state: AppState, task: TaskTemplate, target_date: date) -> bool:
-    date_str = target_date.isoformat()
-    for c in state.task_completions:
-        if c.task_id == task.id and c.date == date_str:
-            return True
-            
+    # Pure check: a timed task past its target counts as done even before
+    # mark_task_completed records it (that happens when its timer stops).
+    if get_index(state).is_completed(task.id, target_date.isoformat()):
+        return True
     if task.target_minutes is None:
         return False
-        
-    minutes_done = get_task_minutes_for_date(state, task.id, target_date)
-    if minutes_done >= task.target_minutes:
-        comp = TaskCompletion(str(uuid.uuid4()), task.id, date_str)
-        state.task_completions.append(comp)
-        return True
-    return False
+    return get_task_minutes_for_date(state, task.id, target_date) >= task.target_minutes
+
+def mark_task_completed(state: AppState, task_id: str, target_date: date) -> Optional[TaskCompletion]:
+    """Records a completion once per (task, day); returns None if already recorded."""
+    ensure_months(state, [archive.month_key(target_date)])
+    index = get_index(state)
+    date_str = target_date.isoformat()
+    if index.is_completed(task_id, date_str):
+        return None
+    comp = TaskCompletion(str(uuid.uuid4()), task_id, date_str)
+    state.task_completions.append(comp)
+    index.completion_added(comp)
+    state.changes.touch("task_completions", comp.id, comp)
+    return comp
 
 def get_tasks_for_date(state: AppState, target_date: date) -> List[TaskTemplate]:
-    return [t for t in state.tasks.values() if is_task_scheduled_for_date(t, target_date)]
+    matrix = schedule.expand(state.tasks.values(), target_date, target_date)
+    return [state.tasks[task_id] for task_id in matrix.tasks_on(target_date)]
 
 # --- Timer / Session Logic ---
 
 def get_active_session(state: AppState, task_id: str) -> Optional[TimerSession]:
-    for session in state.sessions.values():
-        if session.task_id == task_id and session.end_time is None:
-            return session
-    return None
+    return get_index(state).active_session(task_id)
 
 def get_all_active_sessions(state: AppState) -> List[TimerSession]:
-    return [s for s in state.sessions.values() if s.end_time is None]
+    return get_index(state).active_sessions()
 
 def start_timer_for_task(state: AppState, task_id: str) -> TimerSession:
     existing = get_active_session(state, task_id)
@@ -143,43 +232,75 @@ def start_timer_for_task(state: AppState, task_id: str) -> TimerSession:
     session = TimerSession(
         id=session_id,
         task_id=task_id,
-        start_time=datetime.now().isoformat(),
+        start_time=now_ts(),
         duration_seconds=0
     )
     state.sessions[session_id] = session
+    get_index(state).session_started(session)
+    state.changes.touch("sessions", session_id, session)
     return session
 
 def stop_timer_for_session(state: AppState, session_id: str) -> TimerSession:
     session = state.sessions.get(session_id)
     if not session or session.end_time: return session
+    # Before closing the session, so a first-time rebuild can't count it twice
+    day_rollups = get_rollups(state)
     
-    end_dt = datetime.now()
-    start_dt = datetime.fromisoformat(session.start_time)
-    duration = (end_dt - start_dt).total_seconds()
-    
-    session.duration_seconds = int(duration)
-    session.end_time = end_dt.isoformat()
-    
+    end_ts = now_ts()
+    session.duration_seconds = end_ts - session.start_time
+    session.end_time = end_ts
+    get_index(state).session_stopped(session)
+    state.changes.touch("sessions", session.id, session)
+    _credit_session(state, session, day_rollups)
+    return session
+
+def record_session(state: AppState, task_id: str, start_time: int, end_time: int) -> TimerSession:
+    """Adds a finished session after the fact (imports, forgotten timers),
+    credited exactly like one stopped by stop_timer_for_session."""
+    if end_time < start_time:
+        raise ValueError("session ends before it starts")
+    # Its day's log and completions must be in memory before they are updated
+    start_day = date.fromtimestamp(start_time)
+    ensure_history(state, start_day, start_day)
+    day_rollups = get_rollups(state)
+    session = TimerSession(str(uuid.uuid4()), task_id, start_time, end_time - start_time, end_time)
+    state.sessions[session.id] = session
+    get_index(state).session_recorded(session)
+    state.changes.touch("sessions", session.id, session)
+    _credit_session(state, session, day_rollups)
+    return session
+
+def _credit_session(state: AppState, session: TimerSession, day_rollups: Dict[str, DayRollup]) -> None:
+    start_day = date.fromtimestamp(session.start_time)
     task = state.tasks.get(session.task_id)
     if task and task.stat_name and task.stat_name in state.stats:
         state.stats[task.stat_name].add_seconds(session.duration_seconds)
+        state.changes.touch("stats", task.stat_name, state.stats[task.stat_name])
+    roll = rollups.add_session(day_rollups, session, *_rollup_keys(state, session.task_id))
+    state.changes.touch("rollups", roll.date, roll)
     
-    ensure_daily_log(state, start_dt.date())
+    ensure_daily_log(state, start_day)
     
     if task:
-        is_task_completed_for_date(state, task, start_dt.date())
+        if task.target_minutes is not None and \
+                get_task_minutes_for_date(state, task.id, start_day) >= task.target_minutes:
+            mark_task_completed(state, task.id, start_day)
         state.profile.xp += task.xp_reward
         state.profile.points += task.point_reward
         
     recalc_level_from_xp(state.profile)
-    return session
+    state.changes.touch("profile", record=state.profile)
 
 # --- Routines & Misc Helpers ---
 
 def ensure_daily_log(state: AppState, log_date: date) -> DailyRoutineLog:
+    # An archived day's log must be loaded, or a blank one would replace it on save
+    ensure_months(state, [archive.month_key(log_date)])
     d_str = log_date.isoformat()
     if d_str not in state.daily_logs:
         state.daily_logs[d_str] = DailyRoutineLog(date=d_str)
+    # Callers mutate the returned log, so it is always considered changed
+    state.changes.touch("daily_logs", d_str, state.daily_logs[d_str])
     return state.daily_logs[d_str]
 
 def create_book_project(state: AppState, title: str, total_pages: int, daily_target: int) -> BookProject:
@@ -193,6 +314,7 @@ def create_book_project(state: AppState, title: str, total_pages: int, daily_tar
         is_completed=False
     )
     state.book_projects[new_id] = book
+    state.changes.touch("book_projects", new_id, book)
     return book
 
 def update_book_progress(state: AppState, book_id: str, pages_written_today: int, log_date: date) -> None:
@@ -202,6 +324,7 @@ def update_book_progress(state: AppState, book_id: str, pages_written_today: int
     book.pages_written += pages_written_today
     if book.pages_written >= book.total_pages:
         book.is_completed = True
+    state.changes.touch("book_projects", book_id, book)
         
     log = ensure_daily_log(state, log_date)
     log.pages_written += pages_written_today
@@ -212,6 +335,7 @@ def set_daily_zikr(state: AppState, log_date: date, count: int) -> None:
 
 def update_zikr_target(state: AppState, new_target: int) -> None:
     state.settings.zikr_daily_target = new_target
+    state.changes.touch("settings", record=state.settings)
 
 def set_daily_income(state: AppState, log_date: date, total_amount: float) -> None:
     log = ensure_daily_log(state, log_date)
@@ -221,25 +345,71 @@ def set_daily_income(state: AppState, log_date: date, total_amount: float) -> No
     if delta == 0: return
 
     log.income_amount = total_amount
-    state.wallet.balance += delta
-    
-    t_id = str(uuid.uuid4())
+    record_transaction(state, delta, INCOME_CATEGORY, f"Manual routine update for {log_date}")
+
+def record_transaction(
+    state: AppState, amount: float, category: str,
+    description: Optional[str] = None, timestamp: Optional[int] = None
+) -> Transaction:
+    """Books amount against the wallet balance; timestamp defaults to now."""
+    if timestamp is not None:
+        ensure_months(state, [archive.month_key(date.fromtimestamp(timestamp))])
     txn = Transaction(
-        id=t_id,
-        timestamp=datetime.now().isoformat(),
-        amount=delta,
-        category="Income Adjustment",
-        description=f"Manual routine update for {log_date}"
+        id=str(uuid.uuid4()),
+        timestamp=now_ts() if timestamp is None else timestamp,
+        amount=amount,
+        category=category,
+        description=description
     )
+    state.wallet.balance += amount
     state.wallet.transactions.append(txn)
+    get_index(state).transaction_added(txn)
+    state.changes.touch("wallet", record=state.wallet)
+    state.changes.touch("transactions", txn.id, txn)
+    return txn
+
+# --- Wallet Ledger ---
 
-def add_amca_action(state: AppState, xp_reward: int, note: Optional[str] = None) -> AmcaAction:
-    ts = datetime.now()
-    action = AmcaAction(str(uuid.uuid4()), ts.isoformat(), xp_reward, note)
+def get_income_between(state: AppState, start: date, end: date, category: Optional[str] = INCOME_CATEGORY) -> float:
+    """Net amount of transactions dated [start, end]; category None sums all."""
+    ensure_history(state, start, end)
+    lo = day_bounds(start)[0]
+    hi = day_bounds(end)[1]
+    return get_index(state).transactions.total_between(lo, hi, category)
+
+def get_month_income(state: AppState, day: date) -> float:
+    """Income recorded in day's month, e.g. month-to-date for today."""
+    ensure_history(state, day, day)
+    month = archive.month_key(day)
+    return get_index(state).transactions.month_total(month, INCOME_CATEGORY)
+
+def get_income_progress(state: AppState, today: date) -> Tuple[float, float]:
+    """(month-to-date income, monthly target)."""
+    return get_month_income(state, today), state.settings.monthly_income_target
+
+def get_balance_on(state: AppState, day: date) -> float:
+    """Wallet balance at the end of day."""
+    ensure_history(state, day, date.today())
+    hi = day_bounds(day)[1]
+    return get_index(state).transactions.balance_before(state.wallet.balance, hi)
+
+def get_monthly_totals(state: AppState, start: date, end: date, category: Optional[str] = INCOME_CATEGORY) -> List[Tuple[str, float]]:
+    ensure_history(state, start, end)
+    ledger = get_index(state).transactions
+    return [(m, ledger.month_total(m, category)) for m in archive.months_between(start, end)]
+
+def add_amca_action(
+    state: AppState, xp_reward: int, note: Optional[str] = None, timestamp: Optional[int] = None
+) -> AmcaAction:
+    ts = now_ts() if timestamp is None else timestamp
+    ensure_history(state, date.fromtimestamp(ts), date.fromtimestamp(ts))
+    action = AmcaAction(str(uuid.uuid4()), ts, xp_reward, note)
     state.amca_actions.append(action)
+    state.changes.touch("amca_actions", action.id, action)
     state.profile.xp += xp_reward
     recalc_level_from_xp(state.profile)
-    ensure_daily_log(state, ts.date()).amca_count += 1
+    state.changes.touch("profile", record=state.profile)
+    ensure_daily_log(state, date.fromtimestamp(ts)).amca_count += 1
     return action
 
 def apply_wake_times(state: AppState, log_date: date, wake_target_time: str, wake_actual_time: str) -> None:
@@ -264,23 +434,204 @@ def apply_wake_times(state: AppState, log_date: date, wake_target_time: str, wak
     except ValueError:
         pass
 
+def apply_streaks(state: AppState, start: date, end: date) -> int:
+    """Evaluates the streak for every day in [start, end], oldest first.
+
+    A day counts when a timer finished on it or its daily log has at least
+    min_amca_per_day amca actions (DailyRoutineLog.amca_count, which
+    imported daily logs carry too); otherwise a freeze is used or the
+    streak resets. Returns the number of days evaluated.
+    """
+    days = (end - start).days + 1
+    if days <= 0: return 0
+    ensure_history(state, start, end)
+    mask = get_index(state).timer_mask(start, days)
+    min_amca = state.settings.min_amca_per_day
+
+    p = state.profile
+    for i in range(days):
+        log = state.daily_logs.get((start + timedelta(days=i)).isoformat())
+        if mask >> i & 1 or (log is not None and log.amca_count >= min_amca):
+            p.streak_days += 1
+            p.xp += 10
+        elif p.streak_freezes > 0:
+            p.streak_freezes -= 1
+        else:
+            p.streak_days = 0
+    recalc_level_from_xp(p)
+    if p.streak_checked_through is None or p.streak_checked_through < end.isoformat():
+        p.streak_checked_through = end.isoformat()
+    state.changes.touch("profile", record=p)
+    return days
+
 def update_streak_for_date(state: AppState, log_date: date) -> None:
-    d_str = log_date.isoformat()
-    log = state.daily_logs.get(d_str)
-    amca_ok = log and log.amca_count >= state.settings.min_amca_per_day
-    
-    timer_ok = False
-    for s in state.sessions.values():
-        if s.end_time and datetime.fromisoformat(s.end_time).date() == log_date:
-            timer_ok = True
-            break
-            
-    if amca_ok or timer_ok:
-        state.profile.streak_days += 1
-        state.profile.xp += 10
-        recalc_level_from_xp(state.profile)
+    apply_streaks(state, log_date, log_date)
+
+def backfill_streaks(state: AppState, today: date) -> int:
+    """Applies the days since the last evaluated one, up to yesterday.
+
+    Profiles that have never been evaluated are only marked as checked
+    through yesterday, since their earlier streak was kept by hand.
+    """
+    yesterday = today - timedelta(days=1)
+    checked = state.profile.streak_checked_through
+    if checked is None:
+        state.profile.streak_checked_through = yesterday.isoformat()
+        state.changes.touch("profile", record=state.profile)
+        return 0
+    return apply_streaks(state, date.fromisoformat(checked) + timedelta(days=1), yesterday)
+
+# --- Batches ---
+
+class Batch:
+    """Mutator calls queued for apply_batch, so a saver commits them as one
+    change: saver.mutate(logic.apply_batch, batch.operations)."""
+
+    def __init__(self):
+        self.operations: List[Tuple[str, tuple, Dict[str, Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def add(self, fn: Callable, *args, **kwargs) -> "Batch":
+        if fn.__name__ not in BATCH_OPERATIONS:
+            raise ValueError(f"{fn.__name__} cannot be batched")
+        self.operations.append((fn.__name__, args, kwargs))
+        return self
+
+_signatures: Dict[str, inspect.Signature] = {}
+
+def _bind_operation(state: AppState, operation) -> Tuple[Callable, inspect.BoundArguments]:
+    name, args, kwargs = operation
+    fn = BATCH_OPERATIONS.get(name)
+    if fn is None:
+        raise ValueError(f"{name!r} cannot be batched")
+    if name not in _signatures:
+        _signatures[name] = inspect.signature(fn)
+    try:
+        bound = _signatures[name].bind(state, *args, **kwargs)
+    except TypeError as e:
+        raise ValueError(f"{name}: {e}") from None
+    for param, records in (("task_id", state.tasks), ("session_id", state.sessions), ("book_id", state.book_projects)):
+        if param in bound.arguments and bound.arguments[param] not in records:
+            raise ValueError(f"{name}: unknown {param} {bound.arguments[param]!r}")
+    if name == "record_session" and bound.arguments["end_time"] < bound.arguments["start_time"]:
+        raise ValueError(f"{name}: session ends before it starts")
+    return fn, bound
+
+def _history_months(calls: List[Tuple[Callable, inspect.BoundArguments]]) -> Set[str]:
+    months = set()
+    for _, bound in calls:
+        for param, value in bound.arguments.items():
+            if param in ("start_time", "timestamp") and value is not None:
+                value = date.fromtimestamp(value)
+            if isinstance(value, date):
+                months.add(archive.month_key(value))
+    return months
+
+def apply_batch(state: AppState, operations: List[Tuple[str, Any, Dict[str, Any]]]) -> List[Any]:
+    """Applies (function name, args, kwargs) operations in order; returns their results.
+
+    Every operation is checked before the first one runs, archived months
+    they touch are loaded in one go, and index upkeep that appends defer
+    (out-of-order ledger rows) is settled once at the end.
+    """
+    calls = [_bind_operation(state, op) for op in operations]
+    ensure_months(state, _history_months(calls))
+    results = [fn(*bound.args, **bound.kwargs) for fn, bound in calls]
+    get_index(state).settle()
+    return results
+
+BATCH_OPERATIONS: Dict[str, Callable] = {fn.__name__: fn for fn in (
+    update_profile_general, update_stat_level,
+    add_task_definition, update_task_definition, delete_task_definition, mark_task_completed,
+    start_timer_for_task, stop_timer_for_session, record_session,
+    create_book_project, update_book_progress,
+    set_daily_zikr, update_zikr_target, set_daily_income, record_transaction,
+    add_amca_action, apply_wake_times,
+)}
+
+# --- Bulk Import ---
+
+IMPORT_KINDS = ("sessions", "transactions", "amca_actions", "daily_logs")
+
+def _record_day(kind: str, record: Any) -> date:
+    if kind == "sessions":
+        return date.fromtimestamp(record.start_time)
+    if kind == "daily_logs":
+        return date.fromisoformat(record.date)
+    return date.fromtimestamp(record.timestamp)
+
+def import_records(state: AppState, kind: str, records: List[Any]) -> int:
+    """Adds a chunk of historical records of one IMPORT_KINDS kind; returns how many were new.
+
+    Records whose id (date for daily logs) is already present are skipped,
+    as are unfinished sessions. Stat time, rollups and the wallet balance
+    are credited once per chunk; XP, completions and daily log counters are
+    not derived from imported history (import daily_logs for those).
+    """
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"unknown import kind {kind!r}")
+    # Their months must be in memory for duplicates to be seen
+    ensure_months(state, {archive.month_key(_record_day(kind, r)) for r in records})
+    index = get_index(state)
+    added = 0
+
+    if kind == "sessions":
+        day_rollups = get_rollups(state)
+        stat_seconds: Dict[str, int] = {}
+        for s in records:
+            if s.end_time is None or s.id in state.sessions:
+                continue
+            state.sessions[s.id] = s
+            index.session_recorded(s)
+            state.changes.touch("sessions", s.id, s)
+            category, stat_name = _rollup_keys(state, s.task_id)
+            roll = rollups.add_session(day_rollups, s, category, stat_name)
+            state.changes.touch("rollups", roll.date, roll)
+            if stat_name:
+                stat_seconds[stat_name] = stat_seconds.get(stat_name, 0) + s.duration_seconds
+            added += 1
+        for name, seconds in stat_seconds.items():
+            state.stats[name].add_seconds(seconds)
+            state.changes.touch("stats", name, state.stats[name])
+
+    elif kind == "transactions":
+        known = {t.id for t in state.wallet.transactions}
+        total = 0.0
+        for t in records:
+            if t.id in known:
+                continue
+            known.add(t.id)
+            state.wallet.transactions.append(t)
+            index.transaction_added(t)
+            state.changes.touch("transactions", t.id, t)
+            total += t.amount
+            added += 1
+        if added:
+            state.wallet.transactions.sort(key=lambda t: t.timestamp)
+            state.wallet.balance += total
+            state.changes.touch("wallet", record=state.wallet)
+
+    elif kind == "amca_actions":
+        known = {a.id for a in state.amca_actions}
+        for a in records:
+            if a.id in known:
+                continue
+            known.add(a.id)
+            state.amca_actions.append(a)
+            state.changes.touch("amca_actions", a.id, a)
+            added += 1
+        if added:
+            state.amca_actions.sort(key=lambda a: a.timestamp)
+
     else:
-        if state.profile.streak_freezes > 0:
-            state.profile.streak_freezes -= 1
-        else:
-            state.profile.streak_days = 0
\ No newline at end of file
+        for log in records:
+            if log.date in state.daily_logs:
+                continue
+            state.daily_logs[log.date] = log
+            state.changes.touch("daily_logs", log.date, log)
+            added += 1
+
+    index.settle()
+    return added
@@ -1,12 +1,16 @@
+import argparse
 import sys
 import os
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
 
 import logic
+import perf
 import storage
+from daemon import DaemonClient, DaemonError, RemoteSaver
 from models import AppState, TaskTemplate
+from saver import BackgroundSaver
 
 
 def print_status_bar(state: AppState):
@@ -23,12 +27,18 @@ def print_summary(state: AppState):
     print(f"Wallet: {state.wallet.balance:.2f}")
     
     print("\n--- Stats ---")
+    today = datetime.now().date()
+    monday = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
     for name, stat in state.stats.items():
         if stat.total_seconds > 0:
             hrs = stat.total_seconds / 3600.0
-            print(f"  {name.title()}: Lvl {stat.level()} ({hrs:.2f} hrs)")
+            series = logic.get_time_series(state, "stats", name, min(monday, month_start), today)
+            week, month = series.total(monday) / 3600.0, series.total(month_start) / 3600.0
+            print(f"  {name.title()}: Lvl {stat.level()} ({hrs:.2f} hrs, week {week:.2f}, month {month:.2f})")
 
     print("\n--- Recent Logs ---")
+    logic.ensure_history(state, today - timedelta(days=3), today)
     sorted_dates = sorted(state.daily_logs.keys(), reverse=True)[:3]
     for d in sorted_dates:
         log = state.daily_logs[d]
@@ -47,7 +57,7 @@ def list_tasks(state: AppState) -> List[TaskTemplate]:
         print(f"{idx + 1}) {t.title} [XP: {t.xp_reward}] (ID: {t.id[:4]}...)")
     return tasks_list
 
-def handle_add_task(state: AppState):
+def handle_add_task(saver):
     print("\n--- Create New Task ---")
     title = input("Title: ").strip()
     desc = input("Description: ").strip()
@@ -64,13 +74,13 @@ def handle_add_task(state: AppState):
     stat_name = input("Stat Name (optional, press Enter to skip): ").strip()
     stat_name = stat_name if stat_name else None
 
-    t = logic.add_task_definition(
-        state, title, desc, cat, "daily", target, xp, points, stat_name
+    t = saver.mutate(
+        logic.add_task_definition, title, desc, cat, "daily", target, xp, points, stat_name
     )
     print(f"Task '{t.title}' created successfully.")
 
-def handle_start_timer(state: AppState):
-    tasks = list_tasks(state)
+def handle_start_timer(saver):
+    tasks = list_tasks(saver.state)
     if not tasks:
         return
     
@@ -78,17 +88,18 @@ def handle_start_timer(state: AppState):
         choice = int(input("Select task # to start: ")) - 1
         if 0 <= choice < len(tasks):
             task = tasks[choice]
-            session = logic.start_timer_for_task(state, task.id)
-            print(f"\nStarted timer for '{task.title}' at {session.start_time}")
+            session = saver.mutate(logic.start_timer_for_task, task.id)
+            start_dt = datetime.fromtimestamp(session.start_time)
+            print(f"\nStarted timer for '{task.title}' at {start_dt.isoformat()}")
             print(f"Session ID: {session.id}")
         else:
             print("Invalid selection.")
     except ValueError:
         print("Invalid input.")
 
-def handle_stop_timer(state: AppState):
-    # Find active sessions (those with end_time is None)
-    active_sessions = [s for s in state.sessions.values() if s.end_time is None]
+def handle_stop_timer(saver):
+    state = saver.state
+    active_sessions = logic.get_all_active_sessions(state)
     
     if not active_sessions:
         print("\nNo active timers running.")
@@ -97,14 +108,14 @@ def handle_stop_timer(state: AppState):
     print("\n--- Active Sessions ---")
     for idx, s in enumerate(active_sessions):
         task_title = state.tasks[s.task_id].title if s.task_id in state.tasks else "Unknown Task"
-        start_dt = datetime.fromisoformat(s.start_time)
+        start_dt = datetime.fromtimestamp(s.start_time)
         print(f"{idx + 1}) {task_title} (Started: {start_dt.strftime('%H:%M:%S')})")
 
     try:
         choice = int(input("Select session # to stop: ")) - 1
         if 0 <= choice < len(active_sessions):
             session = active_sessions[choice]
-            updated_session = logic.stop_timer_for_session(state, session.id)
+            updated_session = saver.mutate(logic.stop_timer_for_session, session.id)
             
             # Duration formatting
             mins = updated_session.duration_seconds // 60
@@ -119,23 +130,24 @@ def handle_stop_timer(state: AppState):
     except ValueError:
         print("Invalid input.")
 
-def handle_amca_action(state: AppState):
+def handle_amca_action(saver):
     print("\n--- Amca Action (Quick Win) ---")
     try:
         xp = int(input("XP Value (default 10): ") or "10")
         note = input("Note (optional): ").strip()
         note = note if note else None
         
-        logic.add_amca_action(state, xp_reward=xp, note=note)
+        saver.mutate(logic.add_amca_action, xp_reward=xp, note=note)
         print(f"Amca action recorded! +{xp} XP.")
     except ValueError:
         print("Invalid input.")
 
-def handle_update_streak(state: AppState):
+def handle_update_streak(saver):
     """Manually trigger streak check for 'today' for demo purposes."""
+    state = saver.state
     today = datetime.now().date()
     old_streak = state.profile.streak_days
-    logic.update_streak_for_date(state, today)
+    saver.mutate(logic.update_streak_for_date, today)
     new_streak = state.profile.streak_days
     
     if new_streak > old_streak:
@@ -145,12 +157,25 @@ def handle_update_streak(state: AppState):
     else:
         print(f"Streak updated. Current: {new_streak} days.")
 
-def main():
-    print("Initializing Life Gamification App (v2)...")
-    state = storage.load_state()
-    
+def open_saver(use_daemon: bool, path: str = storage.DEFAULT_STATE_FILE):
+    """Daemon-backed saver when asked for (and one is running), else a local one."""
+    if use_daemon:
+        client = DaemonClient.connect(path)
+        if client is None:
+            print("No daemon is running (start it with: python daemon.py).")
+            sys.exit(1)
+        return RemoteSaver(client)
+    state = storage.load_state(path)
     # Ensure level name is correct on load
     state.profile.level_name = logic.get_level_name(state.profile.level)
+    return BackgroundSaver(state, path)
+
+def interactive(saver):
+    state = saver.state
+
+    applied = saver.mutate(logic.backfill_streaks, datetime.now().date())
+    if applied:
+        print(f"Streak updated for {applied} missed day(s). Current: {state.profile.streak_days} days.")
 
     while True:
         print_status_bar(state)
@@ -161,27 +186,188 @@ def main():
         print("5) Quick Amca Action")
         print("6) Update Streak (Check Today)")
         print("7) Save and Exit")
+        print("8) Performance Report")
         
         choice = input("Select: ").strip()
         
-        if choice == "1":
-            print_summary(state)
-        elif choice == "2":
-            handle_add_task(state)
-        elif choice == "3":
-            handle_start_timer(state)
-        elif choice == "4":
-            handle_stop_timer(state)
-        elif choice == "5":
-            handle_amca_action(state)
-        elif choice == "6":
-            handle_update_streak(state)
-        elif choice == "7":
-            storage.save_state(state)
-            print("State saved. Goodbye!")
-            break
-        else:
-            print("Invalid option.")
+        try:
+            saver.sync()
+            if choice == "1":
+                print_summary(state)
+            elif choice == "2":
+                handle_add_task(saver)
+            elif choice == "3":
+                handle_start_timer(saver)
+            elif choice == "4":
+                handle_stop_timer(saver)
+            elif choice == "5":
+                handle_amca_action(saver)
+            elif choice == "6":
+                handle_update_streak(saver)
+            elif choice == "7":
+                saver.stop()
+                print("State saved. Goodbye!")
+                break
+            elif choice == "8":
+                print("\n" + perf.report())
+            else:
+                print("Invalid option.")
+        except DaemonError as e:
+            print(f"Daemon error: {e}")
+
+# --- Scripted Commands ---
+# `python main_cli.py amca --xp 10` and friends run one action and exit.
+# Each loads only the sections it reads or writes (for JSON, only their keys
+# are decoded; see storage.load_state) and saves incrementally (journal
+# lines, SQLite rows or section files); with a daemon running they go through it.
+
+def find_task(state: AppState, query: str) -> TaskTemplate:
+    """Task by id, id prefix, title or unique part of a title."""
+    if query in state.tasks:
+        return state.tasks[query]
+    q = query.casefold()
+    for match in (
+        lambda t: t.id.startswith(query),
+        lambda t: t.title.casefold() == q,
+        lambda t: q in t.title.casefold(),
+    ):
+        found = [t for t in state.tasks.values() if match(t)]
+        if len(found) == 1:
+            return found[0]
+        if found:
+            raise LookupError(f"'{query}' matches several tasks: {', '.join(t.title for t in found)}")
+    raise LookupError(f"No task matches '{query}'.")
+
+def format_duration(seconds: int) -> str:
+    h, rem = divmod(seconds, 3600)
+    return f"{h}h {rem // 60:02d}m" if h else f"{rem // 60}m {rem % 60:02d}s"
+
+def cmd_start(saver, args):
+    task = find_task(saver.state, args.task)
+    session = saver.mutate(logic.start_timer_for_task, task.id)
+    print(f"Timer running for '{task.title}' since {datetime.fromtimestamp(session.start_time):%H:%M:%S}.")
+
+def cmd_stop(saver, args):
+    state = saver.state
+    sessions = logic.get_all_active_sessions(state)
+    if args.task:
+        task_id = find_task(state, args.task).id
+        sessions = [s for s in sessions if s.task_id == task_id]
+    if not sessions:
+        print("No active timers running.")
+        return
+    batch = logic.Batch()
+    for s in sessions:
+        batch.add(logic.stop_timer_for_session, s.id)
+    for done in saver.mutate(logic.apply_batch, batch.operations):
+        task = state.tasks.get(done.task_id)
+        title = task.title if task else "Unknown Task"
+        print(f"Stopped '{title}' after {format_duration(done.duration_seconds)}.")
+
+def cmd_amca(saver, args):
+    saver.mutate(logic.add_amca_action, xp_reward=args.xp, note=args.note)
+    log = saver.state.daily_logs[datetime.now().date().isoformat()]
+    print(f"Amca action recorded! +{args.xp} XP ({log.amca_count} today).")
+
+def cmd_zikr(saver, args):
+    today = datetime.now().date()
+    count = args.count
+    if args.add:
+        log = saver.state.daily_logs.get(today.isoformat())
+        count += log.zikr_count if log else 0
+    saver.mutate(logic.set_daily_zikr, today, count)
+    print(f"Zikr today: {count}/{saver.state.settings.zikr_daily_target}")
+
+def cmd_income(saver, args):
+    today = datetime.now().date()
+    amount = args.amount
+    if args.add:
+        log = saver.state.daily_logs.get(today.isoformat())
+        amount += log.income_amount if log else 0.0
+    saver.mutate(logic.set_daily_income, today, amount)
+    mtd, target = logic.get_income_progress(saver.state, today)
+    print(f"Income today: {amount:.2f} TL | Month: {mtd:.2f}/{target:.2f} TL | Balance: {saver.state.wallet.balance:.2f} TL")
+
+def cmd_status(saver, args):
+    state = saver.state
+    print_status_bar(state)
+    now = datetime.now().timestamp()
+    for s in logic.get_all_active_sessions(state):
+        task = state.tasks.get(s.task_id)
+        title = task.title if task else "Unknown Task"
+        print(f"  Running: {title} ({format_duration(int(now - s.start_time))})")
+
+def cmd_summary(saver, args):
+    print_summary(saver.state)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Life Gamification App (CLI). Without a command, starts the interactive menu.")
+    parser.add_argument("--state", default=storage.DEFAULT_STATE_FILE, help="state file (default: %(default)s)")
+    parser.add_argument("--daemon", action="store_true", help="interactive menu: attach to the running daemon")
+    parser.add_argument("--perf", action="store_true", help="record call timings")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    def command(name, handler, sections, help):
+        sub = commands.add_parser(name, help=help)
+        sub.set_defaults(handler=handler, sections=sections)
+        return sub
+
+    sub = command("start", cmd_start, ("tasks", "sessions"), "start the timer of a task")
+    sub.add_argument("task", help="task id (or prefix) or title")
+    sub = command(
+        "stop", cmd_stop,
+        ("tasks", "sessions", "stats", "rollups", "daily_logs", "task_completions", "profile"),
+        "stop running timers"
+    )
+    sub.add_argument("task", nargs="?", help="only this task's timer")
+    sub = command("amca", cmd_amca, ("amca_actions", "daily_logs", "profile"), "record an amca action")
+    sub.add_argument("--xp", type=int, default=10, help="XP reward (default: %(default)s)")
+    sub.add_argument("--note")
+    sub = command("zikr", cmd_zikr, ("daily_logs", "settings"), "set today's zikr count")
+    sub.add_argument("count", type=int)
+    sub.add_argument("--add", action="store_true", help="add to today's count instead")
+    sub = command("income", cmd_income, ("daily_logs", "wallet", "settings"), "set today's income")
+    sub.add_argument("amount", type=float)
+    sub.add_argument("--add", action="store_true", help="add to today's income instead")
+    command("status", cmd_status, ("profile", "wallet", "tasks", "sessions"), "level, balance and running timers")
+    command(
+        "summary", cmd_summary,
+        ("profile", "wallet", "stats", "tasks", "sessions", "rollups", "daily_logs"),
+        "stats, hours and recent logs"
+    )
+    return parser
+
+def run_command(args) -> int:
+    client = DaemonClient.connect(args.state)
+    if client:
+        saver = RemoteSaver(client, sections=args.sections)
+    else:
+        state = storage.load_state(args.state, sections=args.sections)
+        state.profile.level_name = logic.get_level_name(state.profile.level)
+        saver = BackgroundSaver(state, args.state)
+    try:
+        args.handler(saver, args)
+    except (LookupError, DaemonError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        saver.stop()
+    return 0
+
+def main():
+    args = build_parser().parse_args()
+    if args.perf:
+        perf.enable()
+    perf.install()
+
+    if args.command:
+        code = run_command(args)
+        if perf.enabled():
+            print("\n" + perf.report())
+        sys.exit(code)
+
+    print("Initializing Life Gamification App (v2)...")
+    interactive(open_saver(args.daemon, args.state))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,6 +1,26 @@
 import uuid
+import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from datetime import datetime, date, time as dt_time, timedelta
+from typing import Any, Callable, Iterable, List, Dict, FrozenSet, Optional, Set, Tuple, Union
+
+# Timestamps are integer epoch seconds (local wall clock, like
+# datetime.now()). ISO strings only exist in serialized files.
+def now_ts() -> int:
+    return int(time.time())
+
+def ts_to_iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts).isoformat()
+
+def iso_to_ts(value: Union[str, int, float]) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+def day_bounds(day: date) -> Tuple[int, int]:
+    """[start, end) epoch seconds of a local calendar day."""
+    start = datetime.combine(day, dt_time.min)
+    return int(start.timestamp()), int((start + timedelta(days=1)).timestamp())
 
 @dataclass
 class Stat:
@@ -27,6 +47,7 @@ class Profile:
     streak_days: int = 0
     streak_freezes: int = 0
     badges: List[str] = field(default_factory=list)
+    streak_checked_through: Optional[str] = None # Last day applied to the streak
 
 @dataclass
 class TaskTemplate:
@@ -46,31 +67,35 @@ class TaskTemplate:
     custom_every_n_days: Optional[int] = None
     custom_weekdays: Optional[List[int]] = None # 0=Mon, 6=Sun
 
-@dataclass
+# High-volume records are slotted: no per-instance __dict__. They stay
+# row objects rather than columns: the GUI, codec, storage backends and
+# daemon all work on them directly. Only wallet transactions also get a
+# columnar copy (columns.TransactionLedger) for the range-sum queries.
+@dataclass(slots=True)
 class TaskCompletion:
     id: str
     task_id: str
     date: str # YYYY-MM-DD
 
-@dataclass
+@dataclass(slots=True)
 class TimerSession:
     id: str
     task_id: str
-    start_time: str
+    start_time: int
     duration_seconds: int = 0
-    end_time: Optional[str] = None
+    end_time: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class AmcaAction:
     id: str
-    timestamp: str
+    timestamp: int
     xp_reward: int
     note: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     id: str
-    timestamp: str
+    timestamp: int
     amount: float
     category: str
     description: Optional[str] = None
@@ -100,6 +125,14 @@ class DailyRoutineLog:
     wake_actual_time: Optional[str] = None
     wake_penalty: float = 0.0
 
+@dataclass
+class DayRollup:
+    # Seconds of finished sessions started on `date`, per stat/category/task
+    date: str
+    stats: Dict[str, int] = field(default_factory=dict)
+    categories: Dict[str, int] = field(default_factory=dict)
+    tasks: Dict[str, int] = field(default_factory=dict)
+
 @dataclass
 class MaterialGoal:
     id: str
@@ -115,6 +148,45 @@ class Settings:
     min_amca_per_day: int = 1
     wake_penalty_per_minute: float = 1.0
 
+@dataclass
+class ChangeLog:
+    # section -> {key: record}; key is None for singleton sections
+    # (profile, settings, wallet) and record is None for deletions.
+    touched: Dict[str, Dict[Optional[str], Any]] = field(default_factory=dict)
+    # Absolute path this state was last loaded from / fully written to.
+    synced_path: Optional[str] = None
+    # When set (same shape as touched), also collects touches; the daemon
+    # uses it to see what a single call changed.
+    recording: Optional[Dict[str, Dict[Optional[str], Any]]] = None
+
+    def touch(self, section: str, key: Optional[str] = None, record: Any = None) -> None:
+        self.touched.setdefault(section, {})[key] = record
+        if self.recording is not None:
+            self.recording.setdefault(section, {})[key] = record
+
+    def clear(self) -> None:
+        self.touched.clear()
+
+    def take(self) -> Dict[str, Dict[Optional[str], Any]]:
+        """Hands the touches to a save and starts collecting afresh."""
+        taken, self.touched = self.touched, {}
+        return taken
+
+    def restore(self, taken: Dict[str, Dict[Optional[str], Any]]) -> None:
+        """Puts back what a failed save took; a key touched since keeps its newer record."""
+        for section, records in taken.items():
+            current = self.touched.setdefault(section, {})
+            for key, record in records.items():
+                current.setdefault(key, record)
+
+@dataclass
+class ArchiveInfo:
+    # Months ("YYYY-MM") with a partition on disk, and those merged into memory
+    available: Set[str] = field(default_factory=set)
+    loaded: Set[str] = field(default_factory=set)
+    # Set by storage: loads the given months into the state
+    loader: Optional[Callable[["AppState", Iterable[str]], None]] = None
+
 @dataclass
 class AppState:
     profile: Profile
@@ -127,4 +199,20 @@ class AppState:
     material_goals: Dict[str, MaterialGoal]
     daily_logs: Dict[str, DailyRoutineLog]
     settings: Settings
-    task_completions: List[TaskCompletion] = field(default_factory=list)
\ No newline at end of file
+    task_completions: List[TaskCompletion] = field(default_factory=list)
+    rollups: Dict[str, DayRollup] = field(default_factory=dict)
+    # Runtime only, never serialized
+    changes: ChangeLog = field(default_factory=ChangeLog, repr=False, compare=False)
+    index: Any = field(default=None, repr=False, compare=False)  # indexes.StateIndex
+    archive: Optional[ArchiveInfo] = field(default=None, repr=False, compare=False)
+    # Fields loaded from disk when only some were asked for; None means all
+    sections: Optional[FrozenSet[str]] = field(default=None, repr=False, compare=False)
+
+RUNTIME_FIELDS = ("changes", "index", "archive", "sections")
+
+# Fields holding epoch seconds, written as ISO strings on disk
+TIMESTAMP_FIELDS = {
+    TimerSession: ("start_time", "end_time"),
+    AmcaAction: ("timestamp",),
+    Transaction: ("timestamp",),
+}
\ No newline at end of file
@@ -0,0 +1,145 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Opt-in call counters and latency histograms. Nothing is wrapped unless
+# instrumentation is enabled (GAMICIPLINE_PERF=1 or enable()), so the
+# disabled cost is zero: the original functions stay in place. Timings are
+# inclusive, i.e. a logic function that calls get_index includes its time.
+
+ENV_FLAG = "GAMICIPLINE_PERF"
+
+# Bucket upper bounds in microseconds: 1us, 2us, 4us, ... ~67s
+BUCKETS = tuple(2 ** i for i in range(27))
+
+_enabled = os.environ.get(ENV_FLAG, "") not in ("", "0")
+_lock = threading.Lock()
+
+@dataclass
+class Metric:
+    name: str
+    calls: int = 0
+    total_us: float = 0.0
+    max_us: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+
+    def add(self, elapsed_us: float) -> None:
+        self.calls += 1
+        self.total_us += elapsed_us
+        if elapsed_us > self.max_us:
+            self.max_us = elapsed_us
+        bucket = int(elapsed_us).bit_length()
+        self.histogram[min(bucket, len(BUCKETS))] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th call, in microseconds."""
+        rank = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return min(float(BUCKETS[i]), self.max_us) if i < len(BUCKETS) else self.max_us
+        return self.max_us
+
+metrics: Dict[str, Metric] = {}
+
+def enabled() -> bool:
+    return _enabled
+
+def enable() -> None:
+    """Turns recording on; call before install()/instrument_class()."""
+    global _enabled
+    _enabled = True
+
+def record(name: str, elapsed_us: float) -> None:
+    with _lock:
+        metric = metrics.get(name)
+        if metric is None:
+            metric = metrics[name] = Metric(name)
+        metric.add(elapsed_us)
+
+def reset() -> None:
+    with _lock:
+        metrics.clear()
+
+def timed(name: str, fn: Callable) -> Callable:
+    if getattr(fn, "__perf_name__", None):
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(name, (time.perf_counter() - started) * 1e6)
+    wrapper.__perf_name__ = name
+    return wrapper
+
+def instrument_module(module: Any, names: Optional[Iterable[str]] = None) -> None:
+    """Replaces the module's public functions (or just `names`) with timed ones.
+
+    Callers reach these through the module attribute (logic.x, storage.x),
+    so patching the attribute covers both them and intra-module calls.
+    Dispatch tables in the module (logic.BATCH_OPERATIONS) captured the
+    originals at import time, so their entries are swapped too.
+    """
+    if not _enabled:
+        return
+    if names is None:
+        names = [
+            n for n, obj in vars(module).items()
+            if not n.startswith("_") and inspect.isfunction(obj) and obj.__module__ == module.__name__
+        ]
+    swapped = {}
+    for n in names:
+        fn = getattr(module, n)
+        swapped[fn] = timed(f"{module.__name__}.{n}", fn)
+        setattr(module, n, swapped[fn])
+    for table in list(vars(module).values()):
+        if isinstance(table, dict):
+            for key, value in list(table.items()):
+                if inspect.isfunction(value) and value in swapped:
+                    table[key] = swapped[value]
+
+def instrument_class(cls: type, names: Iterable[str]) -> None:
+    """Times methods of cls; do it before instances connect them to signals."""
+    if not _enabled:
+        return
+    for n in names:
+        if n in vars(cls):
+            setattr(cls, n, timed(f"{cls.__name__}.{n}", vars(cls)[n]))
+
+def install() -> None:
+    """Instruments logic and the storage entry points."""
+    import logic
+    import storage
+    instrument_module(logic)
+    instrument_module(storage, ("load_state", "save_state", "load_history", "compact_journal"))
+
+def _fmt(us: float) -> str:
+    if us >= 1e6:
+        return f"{us / 1e6:.2f}s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f}ms"
+    return f"{us:.0f}us"
+
+def report() -> str:
+    if not _enabled:
+        return f"Instrumentation is off (use --perf or {ENV_FLAG}=1)."
+    with _lock:
+        rows = sorted(metrics.values(), key=lambda m: m.total_us, reverse=True)
+    if not rows:
+        return "No calls recorded yet."
+    width = max(len(m.name) for m in rows)
+    lines = [f"{'function':<{width}}  {'calls':>7}  {'total':>9}  {'mean':>9}  {'p50':>9}  {'p95':>9}  {'max':>9}"]
+    for m in rows:
+        lines.append(
+            f"{m.name:<{width}}  {m.calls:>7}  {_fmt(m.total_us):>9}  {_fmt(m.total_us / m.calls):>9}  "
+            f"{_fmt(m.percentile(0.5)):>9}  {_fmt(m.percentile(0.95)):>9}  {_fmt(m.max_us):>9}"
+        )
+    return "\n".join(lines)
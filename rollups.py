@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from models import DayRollup, TimerSession
+from indexes import session_day
+
+# Per-day totals of finished timer time (AppState.rollups, keyed by
+# "YYYY-MM-DD"), kept current by stop_timer_for_session. Ranges are read
+# into a Series whose prefix sums answer any sub-range, week or month in
+# O(1), so reports never walk the sessions themselves.
+
+KINDS = ("stats", "categories", "tasks")
+
+def add_session(
+    rollups: Dict[str, DayRollup], session: TimerSession,
+    category: Optional[str], stat_name: Optional[str]
+) -> DayRollup:
+    day = session_day(session)
+    roll = rollups.get(day)
+    if roll is None:
+        roll = rollups[day] = DayRollup(day)
+    secs = session.duration_seconds
+    roll.tasks[session.task_id] = roll.tasks.get(session.task_id, 0) + secs
+    if category:
+        roll.categories[category] = roll.categories.get(category, 0) + secs
+    if stat_name:
+        roll.stats[stat_name] = roll.stats.get(stat_name, 0) + secs
+    return roll
+
+
+class Series:
+    """Daily seconds for one stat/category/task over [start, end]."""
+
+    def __init__(self, start: date, daily: List[int]):
+        self.start = start
+        self.end = start + timedelta(days=len(daily) - 1)
+        self.daily = daily
+        self.prefix = [0, *accumulate(daily)]
+
+    def total(self, first: Optional[date] = None, last: Optional[date] = None) -> int:
+        i = 0 if first is None else max(0, (first - self.start).days)
+        j = len(self.daily) if last is None else min(len(self.daily), (last - self.start).days + 1)
+        return self.prefix[j] - self.prefix[i] if j > i else 0
+
+    def days(self) -> List[Tuple[date, int]]:
+        return [(self.start + timedelta(days=i), secs) for i, secs in enumerate(self.daily)]
+
+    def weekly(self) -> List[Tuple[date, int]]:
+        """(monday, seconds) per week overlapping the range; edge weeks are partial."""
+        weeks = []
+        monday = self.start - timedelta(days=self.start.weekday())
+        while monday <= self.end:
+            weeks.append((monday, self.total(monday, monday + timedelta(days=6))))
+            monday += timedelta(days=7)
+        return weeks
+
+    def monthly(self) -> List[Tuple[str, int]]:
+        """("YYYY-MM", seconds) per month overlapping the range."""
+        months = []
+        first = self.start.replace(day=1)
+        while first <= self.end:
+            following = (first + timedelta(days=32)).replace(day=1)
+            months.append((first.strftime("%Y-%m"), self.total(first, following - timedelta(days=1))))
+            first = following
+        return months
+
+def series(rollups: Dict[str, DayRollup], kind: str, key: str, start: date, end: date) -> Series:
+    if kind not in KINDS:
+        raise ValueError(f"unknown rollup kind {kind!r}")
+    daily = []
+    day = start
+    while day <= end:
+        roll = rollups.get(day.isoformat())
+        daily.append(getattr(roll, kind).get(key, 0) if roll else 0)
+        day += timedelta(days=1)
+    return Series(start, daily)
+
+def keys(rollups: Dict[str, DayRollup], kind: str) -> List[str]:
+    """Every stat/category/task that has time recorded."""
+    seen = {}
+    for roll in rollups.values():
+        seen.update(dict.fromkeys(getattr(roll, kind)))
+    return list(seen)
@@ -0,0 +1,151 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import storage
+from models import AppState
+
+
+class BackgroundSaver:
+    """Coalesces bursts of state mutations into one write on a worker thread.
+
+    Mutations go through `mutate`/`editing`, which hold `lock` so the worker
+    never serializes a half-applied change, then re-arm the quiet-period
+    timer. The write happens once nothing changed for `delay` seconds; the
+    worker only holds `lock` while encoding, not while writing files.
+    `on_write` runs after each successful write, on the writing thread.
+    A failed write is reported to `on_error` and retried after `RETRY_DELAY`.
+    """
+
+    RETRY_DELAY = 5.0
+
+    def __init__(
+        self, state: AppState, path: str = storage.DEFAULT_STATE_FILE,
+        delay: float = 1.0, journal: bool = True,
+        on_write: Optional[Callable[[], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None
+    ):
+        self.state = state
+        self.path = path
+        self.delay = delay
+        self.journal = journal
+        self.on_write = on_write
+        self.on_error = on_error
+        self.lock = threading.RLock()
+
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._deadline: Optional[float] = None
+        self._stopping = False
+
+        self.writes = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+        self._thread = threading.Thread(target=self._run, name="state-saver", daemon=True)
+        self._thread.start()
+
+    # --- Mutation API ---
+
+    def mark_dirty(self) -> None:
+        with self._cond:
+            self._pending += 1
+            self._deadline = time.monotonic() + self.delay
+            self._cond.notify()
+
+    @contextmanager
+    def editing(self) -> Iterator[AppState]:
+        with self.lock:
+            yield self.state
+        self.mark_dirty()
+
+    def mutate(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self.editing():
+            return fn(self.state, *args, **kwargs)
+
+    # --- Writing ---
+
+    def _take_pending(self) -> int:
+        with self._cond:
+            count = self._pending
+            self._pending = 0
+            self._deadline = None
+            return count
+
+    def _write(self, count: int) -> None:
+        started = time.perf_counter()
+        try:
+            with self.lock:
+                write = storage.prepare_save(self.state, self.path, journal=self.journal)
+            write()
+        except Exception as e:
+            # Any failure keeps the worker alive; prepare_save hands the changes back
+            print(f"Background save failed: {type(e).__name__}: {e}")
+            self.errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            with self._cond:
+                self._pending += count
+                self._deadline = time.monotonic() + max(self.delay, self.RETRY_DELAY)
+                self._cond.notify()
+            if self.on_error:
+                self.on_error(self.last_error)
+            return
+        self.last_error = None
+        latency = time.perf_counter() - started
+        self.writes += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._total_latency += latency
+        if self.on_write:
+            self.on_write()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    if self._pending and time.monotonic() >= self._deadline:
+                        break
+                    timeout = None if not self._pending else self._deadline - time.monotonic()
+                    self._cond.wait(timeout)
+                if self._stopping:
+                    return
+            count = self._take_pending()
+            if count:
+                self._write(count)
+
+    def sync(self) -> bool:
+        """Nothing to pull: this process owns the state (see daemon.RemoteSaver)."""
+        return False
+
+    def flush(self) -> None:
+        """Writes any pending changes synchronously on the calling thread."""
+        count = self._take_pending()
+        if count:
+            self._write(count)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+    # --- Monitoring ---
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": self._pending,
+            "writes": self.writes,
+            "errors": self.errors,
+            "last_latency_ms": self.last_latency * 1000,
+            "avg_latency_ms": (self._total_latency / self.writes * 1000) if self.writes else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
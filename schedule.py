@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from models import TaskTemplate
+
+# Batched recurrence expansion. Each task's schedule over a date range is a
+# Python int used as a bitset (bit i set = scheduled on start + i days), so
+# a whole range is built with a few shifts instead of one check per day,
+# and rows combine with & / | across tasks.
+
+
+@lru_cache(maxsize=None)
+def parse_day(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def _every(period: int, first: int, days: int) -> int:
+    """Bits first, first + period, ... below days."""
+    if first >= days:
+        return 0
+    count = (days - first + period - 1) // period
+    # Base-2**period repunit: 1 + 2**p + 2**2p + ... (count terms)
+    pattern = ((1 << (period * count)) - 1) // ((1 << period) - 1)
+    return pattern << first
+
+
+def _first_on_or_after(offset: int, period: int, floor: int) -> int:
+    """Smallest offset + k * period (k >= 0) that is >= floor."""
+    if offset >= floor:
+        return offset
+    return offset + -(-(floor - offset) // period) * period
+
+
+def task_mask(task: TaskTemplate, start: date, days: int) -> int:
+    created = parse_day(task.created_date)
+    created_off = (created - start).days
+    floor = max(created_off, 0)
+
+    if task.recurrence == "once":
+        return 1 << created_off if 0 <= created_off < days else 0
+    if task.recurrence == "daily":
+        return _every(1, floor, days)
+    if task.recurrence == "weekly":
+        return _every(7, _first_on_or_after(created_off, 7, floor), days)
+    if task.recurrence == "monthly":
+        mask = 0
+        year, month = start.year, start.month
+        end = start + timedelta(days=days)
+        while date(year, month, 1) < end:
+            try:
+                off = (date(year, month, created.day) - start).days
+            except ValueError:
+                off = -1  # month is too short for this day
+            if floor <= off < days:
+                mask |= 1 << off
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return mask
+    if task.recurrence == "custom":
+        if task.custom_every_n_days:
+            n = task.custom_every_n_days
+            return _every(n, _first_on_or_after(created_off, n, floor), days)
+        elif task.custom_weekdays:
+            mask = 0
+            for weekday in set(task.custom_weekdays):
+                off = (weekday - start.weekday()) % 7
+                mask |= _every(7, _first_on_or_after(off, 7, floor), days)
+            return mask
+    return 0
+
+
+class ScheduleMatrix:
+    """Tasks x days schedule for [start, end], rows stored as int bitsets."""
+
+    def __init__(self, start: date, end: date, rows: Dict[str, int]):
+        self.start = start
+        self.end = end
+        self.days = (end - start).days + 1
+        self.rows = rows  # task_id -> bitset, in task order
+
+    def _offset(self, day: date) -> Optional[int]:
+        off = (day - self.start).days
+        return off if 0 <= off < self.days else None
+
+    def is_scheduled(self, task_id: str, day: date) -> bool:
+        off = self._offset(day)
+        return off is not None and bool(self.rows.get(task_id, 0) >> off & 1)
+
+    def tasks_on(self, day: date) -> List[str]:
+        off = self._offset(day)
+        if off is None:
+            return []
+        return [task_id for task_id, mask in self.rows.items() if mask >> off & 1]
+
+    def dates_for(self, task_id: str) -> List[date]:
+        mask = self.rows.get(task_id, 0)
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.start + timedelta(days=low.bit_length() - 1))
+            mask ^= low
+        return result
+
+    def occurrences(self, task_id: str) -> int:
+        return self.rows.get(task_id, 0).bit_count()
+
+    def day_mask(self, days: Iterable[date]) -> int:
+        """Bitset of the given days that fall inside the range."""
+        mask = 0
+        for day in days:
+            off = self._offset(day)
+            if off is not None:
+                mask |= 1 << off
+        return mask
+
+    def to_numpy(self):
+        """Boolean (tasks x days) array. Needs numpy, which is optional."""
+        import numpy as np
+        matrix = np.zeros((len(self.rows), self.days), dtype=bool)
+        for row, mask in enumerate(self.rows.values()):
+            raw = np.frombuffer(mask.to_bytes((self.days + 7) // 8, "little"), dtype=np.uint8)
+            matrix[row] = np.unpackbits(raw, bitorder="little")[:self.days].astype(bool)
+        return matrix
+
+
+def expand(tasks: Iterable[TaskTemplate], start: date, end: date) -> ScheduleMatrix:
+    days = (end - start).days + 1
+    rows = {task.id: task_mask(task, start, days) for task in tasks} if days > 0 else {}
+    return ScheduleMatrix(start, end, rows)
@@ -0,0 +1,144 @@
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+import jsonl
+
+# Directory backend for storage.load_state/save_state ("state.d/"): one
+# file per AppState section, so a save only touches the sections that
+# changed. Small sections are JSON documents rewritten whole; high-volume
+# ones are append-only JSON Lines logs of {"k": key, "v": record} (v null
+# for a deletion), folded by key on load, so a new or updated record costs
+# one appended line. Like sqlite_store it speaks the serialized dict shape
+# and the journal's change events.
+
+SECTION_SUFFIX = ".d"
+
+DOCUMENT_SECTIONS = ("profile", "settings", "wallet", "stats", "tasks", "book_projects", "material_goals")
+LOG_SECTIONS = ("sessions", "daily_logs", "rollups", "amca_actions", "transactions", "task_completions")
+# Logs holding what the state dict keeps as lists of records with an "id"
+LIST_LOGS = ("amca_actions", "transactions", "task_completions")
+SINGLETON_SECTIONS = ("profile", "settings", "wallet")
+
+# A log is rewritten once superseded lines outnumber live records by this much
+COMPACT_SLACK = 1000
+
+def is_section_path(path: str) -> bool:
+    return path.rstrip("/\\").endswith(SECTION_SUFFIX)
+
+def _file(path: str, section: str) -> str:
+    return os.path.join(path, section + (".jsonl" if section in LOG_SECTIONS else ".json"))
+
+def _write_atomic(file_path: str, text: str) -> None:
+    with open(file_path + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(file_path + ".tmp", file_path)
+
+def _write_document(path: str, section: str, value: Any) -> None:
+    _write_atomic(_file(path, section), json.dumps(value, ensure_ascii=False))
+
+def _write_log(path: str, section: str, records: Dict[str, Any]) -> None:
+    _write_atomic(_file(path, section), "".join(
+        json.dumps({"k": k, "v": v}, ensure_ascii=False) + "\n" for k, v in records.items()
+    ))
+
+def _read_document(path: str, section: str) -> Any:
+    file_path = _file(path, section)
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _read_log(path: str, section: str, compact: bool) -> Dict[str, Any]:
+    file_path = _file(path, section)
+    if not os.path.exists(file_path):
+        return {}
+    records: Dict[str, Any] = {}
+    lines = 0
+    with open(file_path, 'rb') as f:
+        for entry in jsonl.parse_lines(f, file_path):
+            if "k" not in entry:
+                continue
+            lines += 1
+            if entry.get("v") is None:
+                records.pop(entry["k"], None)
+            else:
+                records[entry["k"]] = entry["v"]
+    if compact and lines - len(records) > max(len(records), COMPACT_SLACK):
+        _write_log(path, section, records)
+    return records
+
+def write_full(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(path, exist_ok=True)
+    wallet = data.get("wallet", {})
+    for section in DOCUMENT_SECTIONS:
+        value = {"balance": wallet.get("balance", 0.0)} if section == "wallet" else data.get(section, {})
+        _write_document(path, section, value)
+    for section in LOG_SECTIONS:
+        if section == "transactions":
+            records = {r["id"]: r for r in wallet.get("transactions", [])}
+        elif section in LIST_LOGS:
+            records = {r["id"]: r for r in data.get(section, [])}
+        else:
+            records = data.get(section, {})
+        _write_log(path, section, records)
+
+def apply_events(path: str, events: List[Dict[str, Any]]) -> None:
+    """Appends log records and rewrites only the documents the events touch."""
+    documents: Dict[str, Any] = {}
+    appends: Dict[str, List[str]] = {}
+    for event in events:
+        section, key, value = event["s"], event["k"], event["v"]
+        if section in LOG_SECTIONS:
+            appends.setdefault(section, []).append(json.dumps({"k": key, "v": value}, ensure_ascii=False) + "\n")
+            continue
+        if section not in documents:
+            documents[section] = _read_document(path, section)
+        if section in SINGLETON_SECTIONS:
+            documents[section].update(value or {})
+        elif value is None:
+            documents[section].pop(key, None)
+        else:
+            documents[section][key] = value
+    for section, lines in appends.items():
+        # A crash mid-append leaves a partial line that the next one must not extend
+        jsonl.repair_tail(_file(path, section))
+        with open(_file(path, section), 'a', encoding='utf-8') as f:
+            f.write("".join(lines))
+    for section, value in documents.items():
+        _write_document(path, section, value)
+
+def read_all(path: str, sections: Optional[Iterable[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    """The stored state dict; given sections (AppState fields), only their files are read.
+
+    compact rewrites logs that are mostly superseded lines; only the
+    process that will write the state should ask for it.
+    """
+    wanted = None if sections is None else set(sections)
+    data: Dict[str, Any] = {}
+    for section in DOCUMENT_SECTIONS:
+        if wanted is None or section in wanted:
+            data[section] = _read_document(path, section)
+    for section in LOG_SECTIONS:
+        field = "wallet" if section == "transactions" else section
+        if wanted is not None and field not in wanted:
+            continue
+        records = _read_log(path, section, compact)
+        if section == "transactions":
+            data.setdefault("wallet", {})["transactions"] = list(records.values())
+        elif section in LIST_LOGS:
+            data[section] = list(records.values())
+        else:
+            data[section] = records
+    return data
+
+def main(argv: List[str]) -> None:
+    if len(argv) != 3 or not is_section_path(argv[2]):
+        print(f"Usage: python section_store.py <source state> <target{SECTION_SUFFIX}>")
+        return
+    import storage
+    storage.convert_state(argv[1], argv[2])
+
+if __name__ == "__main__":
+    main(sys.argv)
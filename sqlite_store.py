@@ -0,0 +1,225 @@
+import json
+import sqlite3
+import sys
+from typing import Dict, Any, Iterator, List, Iterable, Optional
+
+# SQLite backend for storage.load_state/save_state. It speaks the same
+# primitive dict shape as the JSON snapshot (see storage.appstate_to_dict)
+# and the same change events as the journal, so storage keeps owning the
+# conversion to and from models.
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# table -> (columns, primary key); the first column is the primary key
+TABLES = {
+    "sessions": ("id", "task_id", "date", "start_time", "duration_seconds", "end_time"),
+    "task_completions": ("id", "task_id", "date"),
+    "transactions": ("id", "timestamp", "amount", "category", "description"),
+    "amca_actions": ("id", "timestamp", "xp_reward", "note"),
+    "daily_logs": (
+        "date", "pages_written", "zikr_count", "income_amount", "amca_count",
+        "wake_target_time", "wake_actual_time", "wake_penalty"
+    ),
+    "stats": ("name", "total_seconds"),
+}
+
+# Small sections kept as one JSON document per record
+DOCUMENT_SECTIONS = ("tasks", "book_projects", "material_goals", "rollups")
+SINGLETON_SECTIONS = ("profile", "settings", "wallet")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (
+    section TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (section, key)
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY, task_id TEXT NOT NULL, date TEXT NOT NULL,
+    start_time TEXT NOT NULL, duration_seconds INTEGER NOT NULL DEFAULT 0, end_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_task_date ON sessions (task_id, date);
+CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions (start_time);
+CREATE TABLE IF NOT EXISTS task_completions (
+    id TEXT PRIMARY KEY, task_id TEXT NOT NULL, date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completions_task_date ON task_completions (task_id, date);
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY, timestamp TEXT NOT NULL, amount REAL NOT NULL,
+    category TEXT NOT NULL, description TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions (timestamp);
+CREATE TABLE IF NOT EXISTS amca_actions (
+    id TEXT PRIMARY KEY, timestamp TEXT NOT NULL, xp_reward INTEGER NOT NULL, note TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_amca_timestamp ON amca_actions (timestamp);
+CREATE TABLE IF NOT EXISTS daily_logs (
+    date TEXT PRIMARY KEY, pages_written INTEGER NOT NULL DEFAULT 0,
+    zikr_count INTEGER NOT NULL DEFAULT 0, income_amount REAL NOT NULL DEFAULT 0,
+    amca_count INTEGER NOT NULL DEFAULT 0, wake_target_time TEXT,
+    wake_actual_time TEXT, wake_penalty REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, total_seconds INTEGER NOT NULL DEFAULT 0);
+"""
+
+def is_sqlite_path(path: str) -> bool:
+    return path.lower().endswith(SQLITE_SUFFIXES)
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def _row_values(table: str, record: Dict[str, Any]) -> tuple:
+    if table == "sessions":
+        # Sessions are bucketed by the day they started, like logic does
+        record = dict(record, date=record["start_time"][:10])
+    return tuple(record.get(col) for col in TABLES[table])
+
+def _upsert(conn: sqlite3.Connection, table: str, records: Iterable[Dict[str, Any]]) -> None:
+    columns = TABLES[table]
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({columns[0]}) DO UPDATE SET {updates}"
+    )
+    conn.executemany(sql, (_row_values(table, r) for r in records))
+
+def _put_meta(conn: sqlite3.Connection, key: str, data: Dict[str, Any]) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, data) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+        (key, json.dumps(data, ensure_ascii=False))
+    )
+
+def _put_document(conn: sqlite3.Connection, section: str, key: str, data: Dict[str, Any]) -> None:
+    conn.execute(
+        "INSERT INTO documents (section, key, data) VALUES (?, ?, ?) "
+        "ON CONFLICT(section, key) DO UPDATE SET data = excluded.data",
+        (section, key, json.dumps(data, ensure_ascii=False))
+    )
+
+def write_full(path: str, data: Dict[str, Any]) -> None:
+    conn = connect(path)
+    try:
+        with conn:
+            for table in TABLES:
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM documents")
+            conn.execute("DELETE FROM meta")
+
+            wallet = data.get("wallet", {})
+            _put_meta(conn, "profile", data.get("profile", {}))
+            _put_meta(conn, "settings", data.get("settings", {}))
+            _put_meta(conn, "wallet", {"balance": wallet.get("balance", 0.0)})
+
+            _upsert(conn, "sessions", data.get("sessions", {}).values())
+            _upsert(conn, "task_completions", data.get("task_completions", []))
+            _upsert(conn, "transactions", wallet.get("transactions", []))
+            _upsert(conn, "amca_actions", data.get("amca_actions", []))
+            _upsert(conn, "daily_logs", data.get("daily_logs", {}).values())
+            _upsert(conn, "stats", data.get("stats", {}).values())
+            for section in DOCUMENT_SECTIONS:
+                for key, value in data.get(section, {}).items():
+                    _put_document(conn, section, key, value)
+    finally:
+        conn.close()
+
+def apply_events(path: str, events: List[Dict[str, Any]]) -> None:
+    """Writes journal-style change events as single-row upserts/deletes."""
+    conn = connect(path)
+    try:
+        with conn:
+            for event in events:
+                section, key, value = event["s"], event["k"], event["v"]
+                if section in SINGLETON_SECTIONS:
+                    row = conn.execute("SELECT data FROM meta WHERE key = ?", (section,)).fetchone()
+                    merged = json.loads(row[0]) if row else {}
+                    merged.update(value or {})
+                    _put_meta(conn, section, merged)
+                elif section in DOCUMENT_SECTIONS:
+                    if value is None:
+                        conn.execute("DELETE FROM documents WHERE section = ? AND key = ?", (section, key))
+                    else:
+                        _put_document(conn, section, key, value)
+                elif section in TABLES:
+                    if value is None:
+                        conn.execute(f"DELETE FROM {section} WHERE {TABLES[section][0]} = ?", (key,))
+                    else:
+                        _upsert(conn, section, [value])
+    finally:
+        conn.close()
+
+def _select(conn: sqlite3.Connection, table: str) -> List[Dict[str, Any]]:
+    columns = [c for c in TABLES[table] if not (table == "sessions" and c == "date")]
+    rows = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY rowid")
+    return [dict(zip(columns, row)) for row in rows]
+
+# Time column of each history table, for ordered streaming
+TIME_COLUMNS = {"sessions": "start_time", "transactions": "timestamp", "amca_actions": "timestamp", "daily_logs": "date"}
+
+def iter_rows(path: str, table: str, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """Streams a history table oldest first, chunk_size rows per fetch."""
+    columns = [c for c in TABLES[table] if not (table == "sessions" and c == "date")]
+    conn = connect(path)
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {TIME_COLUMNS[table]}, rowid")
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+    finally:
+        conn.close()
+
+def read_all(path: str, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """The stored state dict; given sections (AppState fields), only those are read."""
+    wanted = None if sections is None else set(sections)
+
+    def want(section: str) -> bool:
+        return wanted is None or section in wanted
+
+    conn = connect(path)
+    try:
+        meta = {k: json.loads(v) for k, v in conn.execute("SELECT key, data FROM meta")}
+        data: Dict[str, Any] = {}
+        for section in ("profile", "settings"):
+            if want(section):
+                data[section] = meta.get(section, {})
+        if want("stats"):
+            data["stats"] = {r["name"]: r for r in _select(conn, "stats")}
+        if want("sessions"):
+            data["sessions"] = {r["id"]: r for r in _select(conn, "sessions")}
+        if want("amca_actions"):
+            data["amca_actions"] = _select(conn, "amca_actions")
+        if want("wallet"):
+            data["wallet"] = {
+                "balance": meta.get("wallet", {}).get("balance", 0.0),
+                "transactions": _select(conn, "transactions"),
+            }
+        if want("daily_logs"):
+            data["daily_logs"] = {r["date"]: r for r in _select(conn, "daily_logs")}
+        if want("task_completions"):
+            data["task_completions"] = _select(conn, "task_completions")
+        documents = [section for section in DOCUMENT_SECTIONS if want(section)]
+        for section in documents:
+            data[section] = {}
+        if documents:
+            marks = ", ".join("?" * len(documents))
+            rows = conn.execute(
+                f"SELECT section, key, data FROM documents WHERE section IN ({marks}) ORDER BY rowid", documents
+            )
+            for section, key, value in rows:
+                data[section][key] = json.loads(value)
+        return data
+    finally:
+        conn.close()
+
+def main(argv: List[str]) -> None:
+    if len(argv) != 3:
+        print("Usage: python sqlite_store.py <state.json> <state.db>")
+        return
+    import storage
+    storage.migrate_json_to_sqlite(argv[1], argv[2])
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -1,16 +1,45 @@
 import json
 import os
+import threading
+import sqlite3
+import struct
+import functools
 import dataclasses
-from datetime import date
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, FrozenSet, Iterable, List, Optional, Set
 from models import (
-    AppState, Profile, Stat, TaskTemplate, TimerSession, 
-    AmcaAction, Wallet, Transaction, BookProject, 
-    DailyRoutineLog, MaterialGoal, Settings, TaskCompletion
+    AppState, Profile, Stat, Wallet, Settings, ArchiveInfo, TaskTemplate, TimerSession,
+    AmcaAction, Transaction, TaskCompletion, BookProject, MaterialGoal, DailyRoutineLog, DayRollup
 )
+import archive
+import binfmt
+import codec
+import jsonl
+import section_store
+import sqlite_store
+from indexes import StateIndex
 
 DEFAULT_STATE_FILE = "state.json"
 
+# Journal is folded into the snapshot once it grows past this many bytes
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+# Sections stored as lists of records with an "id" field, and where they
+# live inside the serialized state dict.
+LIST_SECTIONS = {
+    "amca_actions": ("amca_actions",),
+    "transactions": ("wallet", "transactions"),
+    "task_completions": ("task_completions",),
+}
+SINGLETON_SECTIONS = ("profile", "settings", "wallet")
+
+# Record type of each section, for decoding change events into models
+SECTION_MODELS = {
+    "profile": Profile, "settings": Settings, "stats": Stat, "tasks": TaskTemplate,
+    "sessions": TimerSession, "amca_actions": AmcaAction, "transactions": Transaction,
+    "task_completions": TaskCompletion, "book_projects": BookProject,
+    "material_goals": MaterialGoal, "daily_logs": DailyRoutineLog, "rollups": DayRollup,
+}
+
 def default_state() -> AppState:
     stat_names = [
         "yazılım", "yazarlık", "liderlik", "satış", 
@@ -33,67 +62,543 @@ def default_state() -> AppState:
     )
 
 def appstate_to_dict(state: AppState) -> Dict[str, Any]:
-    return dataclasses.asdict(state)
+    return codec.encode_state(state)
 
 def dict_to_appstate(data: Dict[str, Any]) -> AppState:
-    profile = Profile(**data.get("profile", {}))
-    stats = {k: Stat(**v) for k, v in data.get("stats", {}).items()}
-    
-    # Tasks: Handle new fields with defaults for backward compatibility
-    tasks = {}
-    for k, v in data.get("tasks", {}).items():
-        # Ensure new fields exist if loading old data
-        if "created_date" not in v:
-            v["created_date"] = date.today().isoformat()
-        if "custom_every_n_days" not in v:
-            v["custom_every_n_days"] = None
-        if "custom_weekdays" not in v:
-            v["custom_weekdays"] = None
-        tasks[k] = TaskTemplate(**v)
-
-    sessions = {k: TimerSession(**v) for k, v in data.get("sessions", {}).items()}
-    amca_actions = [AmcaAction(**item) for item in data.get("amca_actions", [])]
-    
-    wallet_data = data.get("wallet", {})
-    transactions = [Transaction(**t) for t in wallet_data.get("transactions", [])]
-    wallet = Wallet(balance=wallet_data.get("balance", 0.0), transactions=transactions)
-
-    book_projects = {k: BookProject(**v) for k, v in data.get("book_projects", {}).items()}
-    material_goals = {k: MaterialGoal(**v) for k, v in data.get("material_goals", {}).items()}
-    daily_logs = {k: DailyRoutineLog(**v) for k, v in data.get("daily_logs", {}).items()}
-    settings = Settings(**data.get("settings", {}))
-    
-    # New: Task Completions
-    completions_data = data.get("task_completions", [])
-    task_completions = [TaskCompletion(**c) for c in completions_data]
+    return _drop_duplicate_completions(codec.decode_state(data))
 
-    return AppState(
-        profile=profile,
-        stats=stats,
-        tasks=tasks,
-        sessions=sessions,
-        amca_actions=amca_actions,
-        wallet=wallet,
-        book_projects=book_projects,
-        material_goals=material_goals,
-        daily_logs=daily_logs,
-        settings=settings,
-        task_completions=task_completions
-    )
+def _drop_duplicate_completions(state: AppState) -> AppState:
+    # Older versions could record the same (task, date) completion many
+    # times; only the first one is kept.
+    task_completions = []
+    duplicate_ids = []
+    seen = set()
+    for c in state.task_completions:
+        key = (c.task_id, c.date)
+        if key in seen:
+            duplicate_ids.append(c.id)
+            continue
+        seen.add(key)
+        task_completions.append(c)
+    state.task_completions = task_completions
+    # Recorded as deletions so incremental backends drop them on next save
+    for c_id in duplicate_ids:
+        state.changes.touch("task_completions", c_id, None)
+    return state
+
+# --- Journal ---
+# In journal mode each save appends one JSON line per touched record to
+# "<name>.journal.jsonl" next to the snapshot instead of rewriting it:
+#   {"s": section, "k": key, "v": record dict or null for deletions}
+# load_state replays the journal over the snapshot, and compact_journal
+# folds it back into the snapshot on a background thread.
+
+_journal_lock = threading.Lock()
+_compacting = set()
+_generations: Dict[str, int] = {}
+
+def journal_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".journal.jsonl"
+
+def _encode_event(section: str, key: Optional[str], record: Any) -> Dict[str, Any]:
+    if record is None:
+        value = None
+    elif section == "wallet":
+        # Transactions are journaled individually, only the balance lives here
+        value = {"balance": record.balance}
+    else:
+        value = codec.encode(record)
+    return {"s": section, "k": key, "v": value}
+
+def apply_event(data: Dict[str, Any], event: Dict[str, Any], seen_ids: Dict[str, set]) -> None:
+    section, key, value = event["s"], event["k"], event["v"]
+
+    if section in SINGLETON_SECTIONS:
+        data.setdefault(section, {}).update(value or {})
+    elif section in LIST_SECTIONS:
+        container = data
+        *parents, leaf = LIST_SECTIONS[section]
+        for name in parents:
+            container = container.setdefault(name, {})
+        records = container.setdefault(leaf, [])
+        if section not in seen_ids:
+            seen_ids[section] = {r["id"] for r in records}
+        if value is None:
+            container[leaf] = [r for r in records if r["id"] != key]
+            seen_ids[section].discard(key)
+        elif key not in seen_ids[section]:
+            # Records are append-only; a replayed duplicate is skipped
+            records.append(value)
+            seen_ids[section].add(key)
+    else:
+        records = data.setdefault(section, {})
+        if value is None:
+            records.pop(key, None)
+        else:
+            records[key] = value
+
+# Journal lines start with the section, so a partial load can skip the others unparsed
+_EVENT_PREFIX = '{"s": "'
+
+def _event_field(section: str) -> str:
+    """AppState field a change event's section belongs to."""
+    return "wallet" if section == "transactions" else section
+
+def _read_journal(
+    path: str, limit: Optional[int] = None, sections: Optional[FrozenSet[str]] = None
+) -> List[Dict[str, Any]]:
+    j_path = journal_path(path)
+    if not os.path.exists(j_path):
+        return []
+    with open(j_path, 'rb') as f:
+        raw = f.read() if limit is None else f.read(limit)
+
+    keep = None
+    if sections is not None:
+        start = len(_EVENT_PREFIX)
+        def keep(line: str) -> bool:
+            if not line.startswith(_EVENT_PREFIX):
+                return True
+            return _event_field(line[start:line.find('"', start)]) in sections
+    return list(jsonl.parse_lines(raw.split(b"\n"), j_path, keep))
+
+# Next to each snapshot, "<name>.offsets.json" records the byte range of
+# every top-level value plus the snapshot's size and mtime, so a partial
+# load can read and decode just the sections it needs. A snapshot that no
+# longer matches its table (edited, or written by something else) is
+# parsed whole.
+
+def offsets_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".offsets.json"
+
+def _dump_snapshot(data: Dict[str, Any], file_path: str) -> Dict[str, List[int]]:
+    """Writes data as json.dump(indent=2) would; returns each key's value byte range."""
+    offsets: Dict[str, List[int]] = {}
+    chunks = [b"{"]
+    pos = 1
+    for i, (key, value) in enumerate(data.items()):
+        head = (",\n  " if i else "\n  ") + json.dumps(key, ensure_ascii=False) + ": "
+        # Nested lines get the extra indent; JSON strings never hold a raw newline
+        body = json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  ").encode('utf-8')
+        chunks.append(head.encode('utf-8'))
+        pos += len(chunks[-1])
+        offsets[key] = [pos, pos + len(body)]
+        chunks.append(body)
+        pos += len(body)
+    chunks.append(b"\n}" if data else b"}")
+    with open(file_path, 'wb') as f:
+        f.write(b"".join(chunks))
+    return offsets
+
+def _write_offsets(path: str, offsets: Dict[str, List[int]]) -> None:
+    st = os.stat(path)
+    table = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sections": offsets}
+    o_path = offsets_path(path)
+    with open(o_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(table, f)
+    os.replace(o_path + ".tmp", o_path)
+
+def _write_snapshot(data: Dict[str, Any], path: str) -> None:
+    tmp_path = path + ".tmp"
+    offsets = _dump_snapshot(data, tmp_path)
+    os.replace(tmp_path, path)
+    _write_offsets(path, offsets)
+
+def encode_events(touched: Dict[str, Dict[Optional[str], Any]]) -> List[Dict[str, Any]]:
+    return [
+        _encode_event(section, key, record)
+        for section, records in touched.items()
+        for key, record in records.items()
+    ]
+
+def change_events(state: AppState) -> List[Dict[str, Any]]:
+    return encode_events(state.changes.touched)
+
+def _assign(target: Any, source: Any) -> None:
+    for f in dataclasses.fields(target):
+        setattr(target, f.name, getattr(source, f.name))
+
+def apply_state_events(state: AppState, events: Iterable[Dict[str, Any]]) -> None:
+    """Applies change events to a live AppState (a daemon client's mirror).
+
+    Existing records are updated in place so references held by the index
+    stay valid; the index is kept current for appends and timer start/stop
+    and dropped (rebuilt on next use) for anything else.
+    """
+    index = state.index
+    rebuild = False
+    for event in events:
+        section, key, value = event["s"], event["k"], event["v"]
+        if section == "wallet":
+            state.wallet.balance = (value or {}).get("balance", state.wallet.balance)
+            continue
+        record = None if value is None else codec.decode(SECTION_MODELS[section], value)
+        if section in ("profile", "settings"):
+            _assign(getattr(state, section), record)
+        elif section in LIST_SECTIONS:
+            records = state.wallet.transactions if section == "transactions" else getattr(state, section)
+            pos = next((i for i, r in enumerate(records) if r.id == key), None)
+            if record is None:
+                if pos is not None:
+                    del records[pos]
+                    rebuild = True
+            elif pos is not None:
+                _assign(records[pos], record)
+                rebuild = True
+            else:
+                records.append(record)
+                if index and section == "transactions":
+                    index.transaction_added(record)
+                elif index and section == "task_completions":
+                    index.completion_added(record)
+        else:
+            records = getattr(state, section)
+            current = records.get(key)
+            if record is None:
+                records.pop(key, None)
+                rebuild = rebuild or section == "sessions"
+            elif current is None:
+                records[key] = record
+                if section == "sessions":
+                    if index and record.end_time is None:
+                        index.session_started(record)
+                    else:
+                        rebuild = True
+            else:
+                was_open = section == "sessions" and current.end_time is None
+                _assign(current, record)
+                if was_open and current.end_time is not None:
+                    if index:
+                        index.session_stopped(current)
+                elif section == "sessions":
+                    rebuild = True
+    if rebuild:
+        state.index = None
+
+def _append_journal(events: List[Dict[str, Any]], path: str) -> None:
+    lines = [json.dumps(event, ensure_ascii=False) for event in events]
+    if lines:
+        with _journal_lock:
+            jsonl.repair_tail(journal_path(path))
+            with open(journal_path(path), 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+
+def compact_journal(path: str = DEFAULT_STATE_FILE) -> None:
+    """Folds the journal into the snapshot. Safe to run while saves continue."""
+    j_path = journal_path(path)
+    with _journal_lock:
+        if not os.path.exists(j_path):
+            return
+        # Whole lines only, so the tail kept below starts on a line boundary
+        jsonl.repair_tail(j_path)
+        consumed = os.path.getsize(j_path)
+        generation = _generations.get(os.path.abspath(path), 0)
+
+    data = _read_snapshot(path)
+    seen_ids: Dict[str, set] = {}
+    for event in _read_journal(path, consumed):
+        apply_event(data, event, seen_ids)
+    parts = archive.split(data, archive.current_month())
+    tmp_path = path + ".compact"
+    offsets = _dump_snapshot(data, tmp_path)
+
+    with _journal_lock:
+        if _generations.get(os.path.abspath(path), 0) != generation:
+            # A full save replaced the snapshot meanwhile, ours is stale
+            os.remove(tmp_path)
+            return
+        for month, part in parts.items():
+            archive.write_partition(path, month, part)
+        os.replace(tmp_path, path)
+        _write_offsets(path, offsets)
+        with open(j_path, 'rb') as f:
+            f.seek(consumed)
+            tail = f.read()
+        if tail:
+            with open(j_path, 'wb') as f:
+                f.write(tail)
+        else:
+            os.remove(j_path)
+
+def _compact_in_background(path: str) -> None:
+    with _journal_lock:
+        if path in _compacting: return
+        _compacting.add(path)
+
+    def run():
+        try:
+            compact_journal(path)
+        except (OSError, ValueError) as e:
+            print(f"Journal compaction failed: {e}")
+        finally:
+            with _journal_lock:
+                _compacting.discard(path)
+
+    threading.Thread(target=run, name="journal-compaction", daemon=True).start()
+
+def _load_archived_months(state: AppState) -> None:
+    # Formats without month partitions need the archived history in memory
+    if state.archive and state.archive.loader:
+        state.archive.loader(state, state.archive.available)
+
+def _incremental_store(path: str):
+    """Backend module that saves change events in place, if path uses one."""
+    if sqlite_store.is_sqlite_path(path):
+        return sqlite_store
+    if section_store.is_section_path(path):
+        return section_store
+    return None
+
+def save_state(
+    state: AppState, path: str = DEFAULT_STATE_FILE,
+    journal: bool = False, fmt: Optional[str] = None
+) -> None:
+    """fmt is "json" or "binary"; by default an existing file keeps its format."""
+    prepare_save(state, path, journal, fmt)()
+
+def prepare_save(
+    state: AppState, path: str = DEFAULT_STATE_FILE,
+    journal: bool = False, fmt: Optional[str] = None
+) -> Callable[[], None]:
+    """Encodes state for save_state and returns the step that writes the files.
+
+    Only this part reads the state, so a caller guarding it with a lock can
+    run the write after releasing it (see saver.BackgroundSaver). The write
+    takes over the pending changes and puts them back if it fails.
+    """
+    abs_path = os.path.abspath(path)
+    if state.sections is not None:
+        # Unloaded sections would be written out empty by a full save
+        if state.changes.synced_path != abs_path or not os.path.exists(path) or fmt == "binary":
+            raise ValueError(f"a partially loaded state can only be saved incrementally to {state.changes.synced_path}")
+        journal = True
+    synced = state.changes.synced_path == abs_path and os.path.exists(path)
+    store = _incremental_store(path)
+    if store:
+        # Every SQLite / section directory save is incremental once it mirrors this state
+        if synced:
+            events = change_events(state)
+            return _deferred(state, lambda: store.apply_events(path, events))
+        _load_archived_months(state)
+        data = appstate_to_dict(state)
+        return _deferred(state, lambda: store.write_full(path, data), synced_path=abs_path)
+
+    if fmt == "binary" or (fmt is None and binfmt.is_binary(path)):
+        _load_archived_months(state)
+        raw = binfmt.dumps(state)
+        def write_binary() -> None:
+            with _journal_lock:
+                _generations[abs_path] = _generations.get(abs_path, 0) + 1
+                with open(path + ".tmp", 'wb') as f:
+                    f.write(raw)
+                os.replace(path + ".tmp", path)
+                if os.path.exists(journal_path(path)):
+                    os.remove(journal_path(path))
+            print(f"State saved to {path}")
+        return _deferred(state, write_binary, synced_path=abs_path)
+
+    if journal and synced:
+        events = change_events(state)
+        deleted = _deleted_history(events)
+        def write_journal() -> None:
+            if deleted:
+                with _journal_lock:
+                    archive.delete_records(path, deleted)
+            _append_journal(events, path)
+            j_path = journal_path(path)
+            if os.path.exists(j_path) and os.path.getsize(j_path) > JOURNAL_COMPACT_BYTES:
+                _compact_in_background(path)
+        return _deferred(state, write_journal)
 
-def save_state(state: AppState, path: str = DEFAULT_STATE_FILE) -> None:
     data_dict = appstate_to_dict(state)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data_dict, f, indent=2, ensure_ascii=False)
-    print(f"State saved to {path}")
+    parts = archive.split(data_dict, archive.current_month())
+    info = _archive_info(state, path)
+    events = change_events(state)
+    deleted = _deleted_history(events)
+    # Months fully loaded from disk are only rewritten if something in them changed
+    touched = {
+        archive.record_month(e["s"], e["v"]) for e in events
+        if e["s"] in archive.HISTORY_SECTIONS and e["v"] is not None
+    }
+    parts = {month: part for month, part in parts.items() if month not in info.loaded or month in touched}
+    info.available.update(parts)
+    def write_json() -> None:
+        with _journal_lock:
+            _generations[abs_path] = _generations.get(abs_path, 0) + 1
+            # Partitions merge with what memory holds, so deletions are applied to them first
+            if deleted:
+                archive.delete_records(path, deleted)
+            for month, part in parts.items():
+                archive.write_partition(path, month, part)
+            _write_snapshot(data_dict, path)
+            if os.path.exists(journal_path(path)):
+                os.remove(journal_path(path))
+        print(f"State saved to {path}")
+    return _deferred(state, write_json, synced_path=abs_path)
+
+def _deleted_history(events: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    deleted: Dict[str, Set[str]] = {}
+    for e in events:
+        if e["s"] in archive.HISTORY_SECTIONS and e["v"] is None:
+            deleted.setdefault(e["s"], set()).add(e["k"])
+    return deleted
+
+def _deferred(state: AppState, write: Callable[[], None], synced_path: Optional[str] = None) -> Callable[[], None]:
+    taken = state.changes.take()
+    def run() -> None:
+        try:
+            write()
+        except BaseException:
+            state.changes.restore(taken)
+            raise
+        if synced_path:
+            state.changes.synced_path = synced_path
+    return run
+
+def _archive_info(state: AppState, path: str) -> ArchiveInfo:
+    if state.archive is None or state.changes.synced_path != os.path.abspath(path):
+        state.archive = ArchiveInfo(
+            available=archive.available_months(path),
+            loader=functools.partial(load_history, path=path)
+        )
+    return state.archive
+
+def load_history(state: AppState, months: Iterable[str], path: str = DEFAULT_STATE_FILE) -> None:
+    """Merges archived month partitions into a state loaded from path."""
+    info = _archive_info(state, path)
+    part = archive.empty_partition()
+    wanted = sorted(set(months) & info.available - info.loaded)
+    if not wanted:
+        return
+    for month in wanted:
+        archive.merge(part, archive.read_partition(path, month))
+    older = dict_to_appstate({
+        "sessions": part["sessions"],
+        "daily_logs": part["daily_logs"],
+        "amca_actions": part["amca_actions"],
+        "wallet": {"transactions": part["transactions"]},
+        "task_completions": part["task_completions"],
+    })
 
-def load_state(path: str = DEFAULT_STATE_FILE) -> AppState:
+    # Records already in memory are newer than the archived copies
+    for key, session in older.sessions.items():
+        state.sessions.setdefault(key, session)
+    for key, log in older.daily_logs.items():
+        state.daily_logs.setdefault(key, log)
+
+    def merged(current: list, archived: list, sort_key) -> list:
+        ids = {r.id for r in current}
+        return sorted(current + [r for r in archived if r.id not in ids], key=sort_key)
+
+    state.amca_actions = merged(state.amca_actions, older.amca_actions, lambda a: a.timestamp)
+    state.wallet.transactions = merged(state.wallet.transactions, older.wallet.transactions, lambda t: t.timestamp)
+    done = {(c.task_id, c.date) for c in state.task_completions}
+    state.task_completions = sorted(
+        state.task_completions + [c for c in older.task_completions if (c.task_id, c.date) not in done],
+        key=lambda c: c.date
+    )
+    info.loaded.update(wanted)
+    state.index = StateIndex.build(state)
+
+def load_all_history(state: AppState, path: str = DEFAULT_STATE_FILE) -> None:
+    load_history(state, _archive_info(state, path).available, path)
+
+def _read_snapshot(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _read_offsets(path: str) -> Optional[Dict[str, List[int]]]:
+    """The snapshot's offset table, or None if missing or not for this exact file."""
+    try:
+        with open(offsets_path(path), 'r', encoding='utf-8') as f:
+            table = json.load(f)
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(table, dict) or table.get("size") != st.st_size or table.get("mtime_ns") != st.st_mtime_ns:
+        return None
+    return table.get("sections")
+
+def _read_snapshot_sections(path: str, sections: FrozenSet[str]) -> Dict[str, Any]:
+    """Reads and decodes only the given top-level keys, via the offset table.
+
+    Each range must sit right after its own key and decode on its own;
+    otherwise the layout is not what the table describes and the snapshot
+    is parsed whole.
+    """
+    offsets = _read_offsets(path)
+    if offsets is not None:
+        data = {}
+        try:
+            with open(path, 'rb') as f:
+                for key in sections & offsets.keys():
+                    start, end = offsets[key]
+                    head = (json.dumps(key, ensure_ascii=False) + ": ").encode('utf-8')
+                    f.seek(start - len(head))
+                    raw = f.read(end - start + len(head))
+                    if not raw.startswith(head):
+                        raise ValueError(f"offset table does not match at {key!r}")
+                    data[key] = json.loads(raw[len(head):])
+            return data
+        except (ValueError, TypeError) as e:
+            print(f"Reading {path} whole: {e}")
+    return {k: v for k, v in _read_snapshot(path).items() if k in sections}
+
+def load_state(path: str = DEFAULT_STATE_FILE, sections: Optional[Iterable[str]] = None) -> AppState:
+    """sections limits loading to those AppState fields, for short-lived
+    commands; such a state is only ever saved incrementally. SQLite and
+    section directories read only those tables/files; a JSON snapshot
+    reads just those byte ranges when its offset table matches (else it
+    is parsed whole), and only their journal lines are replayed. Binary files have no incremental save and are
+    always loaded whole."""
     if not os.path.exists(path):
         return default_state()
+    is_binary = binfmt.is_binary(path)
+    wanted = None if sections is None or is_binary else frozenset(sections)
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return dict_to_appstate(data)
-    except (json.JSONDecodeError, TypeError, KeyError) as e:
+        if is_binary:
+            with open(path, 'rb') as f:
+                state = _drop_duplicate_completions(binfmt.loads(f.read()))
+        elif sqlite_store.is_sqlite_path(path):
+            state = dict_to_appstate(sqlite_store.read_all(path, wanted))
+        elif section_store.is_section_path(path):
+            # A full load is the writer's; it may compact bloated logs
+            state = dict_to_appstate(section_store.read_all(path, wanted, compact=wanted is None))
+        else:
+            data = _read_snapshot(path) if wanted is None else _read_snapshot_sections(path, wanted)
+            seen_ids: Dict[str, set] = {}
+            for event in _read_journal(path, sections=wanted):
+                apply_event(data, event, seen_ids)
+            state = dict_to_appstate(data)
+    except (json.JSONDecodeError, TypeError, KeyError, ValueError, struct.error, sqlite3.DatabaseError) as e:
         print(f"Error loading state: {e}. Returning default.")
-        return default_state()
\ No newline at end of file
+        return default_state()
+    state.changes.synced_path = os.path.abspath(path)
+    state.sections = wanted
+    if not (is_binary or _incremental_store(path)):
+        _archive_info(state, path)
+    state.index = StateIndex.build(state)
+    return state
+
+def migrate_json_to_sqlite(json_path: str = DEFAULT_STATE_FILE, db_path: str = "state.db") -> AppState:
+    """One-shot copy of a JSON snapshot (plus any pending journal) into SQLite."""
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(json_path)
+    state = load_state(json_path)
+    load_all_history(state, json_path)
+    sqlite_store.write_full(db_path, appstate_to_dict(state))
+    state.changes.clear()
+    state.changes.synced_path = os.path.abspath(db_path)
+    print(f"Migrated {json_path} to {db_path}")
+    return state
+
+def convert_state(src_path: str, dst_path: str, fmt: Optional[str] = None) -> AppState:
+    """Copies a state file (with its journal and archive) to another path/format."""
+    if not os.path.exists(src_path):
+        raise FileNotFoundError(src_path)
+    state = load_state(src_path)
+    _load_archived_months(state)
+    save_state(state, dst_path, fmt=fmt)
+    return state
@@ -0,0 +1,278 @@
+import argparse
+import csv
+import dataclasses
+import json
+import sys
+import typing
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+import archive
+import codec
+import logic
+import sqlite_store
+import storage
+from daemon import DaemonClient, RemoteSaver
+from models import AmcaAction, DailyRoutineLog, TimerSession, Transaction, TIMESTAMP_FIELDS
+from saver import BackgroundSaver
+
+# Streaming CSV / JSON Lines import and export of history records.
+# Rows use the serialized field names (timestamps as ISO strings; imports
+# also take epoch seconds). Session rows carry a "task" column with the
+# task title, so a file can be imported into a state whose task ids differ.
+# Both directions work a chunk or an archived month at a time.
+
+KINDS = {
+    "sessions": TimerSession,
+    "transactions": Transaction,
+    "amca_actions": AmcaAction,
+    "daily_logs": DailyRoutineLog,
+}
+FIELD_TYPES = {cls: typing.get_type_hints(cls) for cls in KINDS.values()}
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+CHUNK_SIZE = 5000
+
+# AppState field holding each kind
+STATE_FIELDS = {"sessions": "sessions", "transactions": "wallet", "amca_actions": "amca_actions", "daily_logs": "daily_logs"}
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt
+    for suffix, name in FORMATS.items():
+        if path.lower().endswith(suffix):
+            return name
+    raise ValueError(f"can't tell the format of {path}; pass --format csv|jsonl")
+
+def columns(kind: str) -> List[str]:
+    names = [f.name for f in dataclasses.fields(KINDS[kind])]
+    return names + ["task"] if kind == "sessions" else names
+
+# --- Export ---
+
+def _time_key(kind: str) -> Callable[[Dict[str, Any]], str]:
+    field = sqlite_store.TIME_COLUMNS[kind]
+    return lambda record: record[field]
+
+def _record_key(kind: str, record: Dict[str, Any]) -> str:
+    return record["date"] if kind == "daily_logs" else record["id"]
+
+def _live_records(state, kind: str) -> Iterator[Any]:
+    if kind == "transactions":
+        return iter(state.wallet.transactions)
+    records = getattr(state, kind)
+    return iter(records.values() if isinstance(records, dict) else records)
+
+def iter_records(path: str, kind: str) -> Iterator[Dict[str, Any]]:
+    """Serialized records of kind, oldest first.
+
+    SQLite streams rows off a cursor. A JSON state reads its live snapshot
+    (and journal) for just this kind, then one archived month at a time,
+    newer live copies replacing archived ones. Binary files load whole.
+    """
+    if sqlite_store.is_sqlite_path(path):
+        yield from sqlite_store.iter_rows(path, kind)
+        return
+    state = storage.load_state(path, sections=[STATE_FIELDS[kind]])
+    encode = codec.ENCODERS[KINDS[kind]]
+    by_time = _time_key(kind)
+    live: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for record in _live_records(state, kind):
+        data = encode(record)
+        live.setdefault(by_time(data)[:7], {})[_record_key(kind, data)] = data
+    available = state.archive.available if state.archive else set()
+    del state  # only the encoded live records are needed from here on
+
+    for month in sorted(available | set(live)):
+        records: Dict[str, Dict[str, Any]] = {}
+        if month in available:
+            part = archive.read_partition(path, month).get(kind, [])
+            for data in (part.values() if isinstance(part, dict) else part):
+                records[_record_key(kind, data)] = data
+        records.update(live.pop(month, {}))
+        yield from sorted(records.values(), key=by_time)
+
+def write_rows(out: TextIO, fmt: str, kind: str, rows: Iterator[Dict[str, Any]]) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=columns(kind), extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def export_file(state_path: str, kind: str, out_path: str, fmt: Optional[str] = None) -> int:
+    """Writes every record of kind to out_path ("-" for stdout); returns the count."""
+    fmt = detect_format(out_path, fmt) if out_path != "-" else (fmt or "jsonl")
+    rows = iter_records(state_path, kind)
+    if kind == "sessions":
+        titles = {k: t.title for k, t in storage.load_state(state_path, sections=["tasks"]).tasks.items()}
+        rows = ({**row, "task": titles.get(row["task_id"])} for row in rows)
+    if out_path == "-":
+        return write_rows(sys.stdout, fmt, kind, rows)
+    with open(out_path, 'w', encoding='utf-8', newline='') as f:
+        return write_rows(f, fmt, kind, rows)
+
+# --- Import ---
+
+@dataclasses.dataclass
+class ImportReport:
+    rows: int = 0
+    added: int = 0
+    skipped: int = 0  # unfinished sessions, unknown tasks, already present
+    errors: List[str] = dataclasses.field(default_factory=list)
+
+def read_rows(f: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+def _coerce(hint: Any, value: Any) -> Any:
+    args = [a for a in typing.get_args(hint) if a is not type(None)]
+    base = args[0] if args else hint
+    if base is int:
+        return int(float(value)) if isinstance(value, str) else int(value)
+    if base is float:
+        return float(value)
+    return str(value) if base is str else value
+
+def parse_record(kind: str, row: Dict[str, Any], task_id: Optional[str] = None) -> Any:
+    """Model record from a row; blank cells fall back to the model defaults."""
+    cls = KINDS[kind]
+    hints = FIELD_TYPES[cls]
+    stamps = TIMESTAMP_FIELDS.get(cls, ())
+    data: Dict[str, Any] = {}
+    for f in dataclasses.fields(cls):
+        value = row.get(f.name)
+        if value is None or value == "":
+            continue
+        if f.name in stamps:
+            # ISO string (as exported) or epoch seconds
+            is_number = isinstance(value, (int, float)) or value.lstrip("-").isdigit()
+            data[f.name] = int(value) if is_number else value
+        else:
+            data[f.name] = _coerce(hints[f.name], value)
+    if kind != "daily_logs":
+        data.setdefault("id", str(uuid.uuid4()))
+    if kind == "sessions":
+        data["task_id"] = task_id
+        record = codec.decode(cls, data)
+        if record.end_time is not None and "duration_seconds" not in data:
+            record.duration_seconds = record.end_time - record.start_time
+        return record
+    return codec.decode(cls, data)
+
+class TaskResolver:
+    """Maps a row's task_id or task title to a task in the state."""
+
+    def __init__(self, saver, create: bool = False):
+        self.saver = saver
+        self.create = create
+        self.by_title = {t.title.casefold(): t.id for t in saver.state.tasks.values()}
+
+    def resolve(self, row: Dict[str, Any]) -> Optional[str]:
+        task_id = row.get("task_id")
+        if task_id and task_id in self.saver.state.tasks:
+            return task_id
+        title = (row.get("task") or "").strip()
+        if not title:
+            return None
+        found = self.by_title.get(title.casefold())
+        if found is None and self.create:
+            task = self.saver.mutate(logic.add_task_definition, title, "", "Imported", "once", None, 0, 0, None)
+            found = self.by_title[title.casefold()] = task.id
+        return found
+
+def import_rows(
+    saver, kind: str, rows: Iterator[Dict[str, Any]],
+    create_tasks: bool = False, chunk_size: int = CHUNK_SIZE
+) -> ImportReport:
+    """Parses rows chunk by chunk into saver.mutate(logic.import_records, ...)."""
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind {kind!r}; one of {', '.join(KINDS)}")
+    report = ImportReport()
+    resolver = TaskResolver(saver, create_tasks) if kind == "sessions" else None
+    chunk: List[Any] = []
+
+    def commit() -> None:
+        added = saver.mutate(logic.import_records, kind, chunk)
+        report.added += added
+        report.skipped += len(chunk) - added
+        chunk.clear()
+
+    for line, row in enumerate(rows, start=1):
+        report.rows += 1
+        try:
+            task_id = None
+            if resolver:
+                task_id = resolver.resolve(row)
+                if task_id is None:
+                    reference = row.get("task") or row.get("task_id")
+                    report.skipped += 1
+                    report.errors.append(f"row {line}: unknown task {reference!r}" if reference else f"row {line}: no task")
+                    continue
+            chunk.append(parse_record(kind, row, task_id))
+        except (KeyError, TypeError, ValueError) as e:
+            report.skipped += 1
+            report.errors.append(f"row {line}: {type(e).__name__}: {e}")
+            continue
+        if len(chunk) >= chunk_size:
+            commit()
+    if chunk:
+        commit()
+    return report
+
+def import_file(saver, kind: str, in_path: str, fmt: Optional[str] = None, create_tasks: bool = False) -> ImportReport:
+    with open(in_path, 'r', encoding='utf-8', newline='') as f:
+        return import_rows(saver, kind, read_rows(f, detect_format(in_path, fmt)), create_tasks)
+
+def open_saver(state_path: str):
+    """The daemon if one serves state_path; else the file, written once at the end."""
+    client = DaemonClient.connect(state_path)
+    if client:
+        return RemoteSaver(client, sections=["tasks"])
+    # A full save: a journal line per imported record would outgrow the snapshot
+    return BackgroundSaver(storage.load_state(state_path), state_path, delay=3600, journal=False)
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog="transfer.py", description="Bulk import/export of history records.")
+    parser.add_argument("--state", default=storage.DEFAULT_STATE_FILE, help="state file (default: %(default)s)")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())), help="default: from the file extension")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write records to a file (- for stdout)")
+    export.add_argument("kind", choices=list(KINDS))
+    export.add_argument("file")
+    imp = commands.add_parser("import", help="add records from a file")
+    imp.add_argument("kind", choices=list(KINDS))
+    imp.add_argument("file")
+    imp.add_argument("--create-tasks", action="store_true", help="create tasks for unknown session titles")
+    args = parser.parse_args(argv[1:])
+
+    if args.command == "export":
+        count = export_file(args.state, args.kind, args.file, args.format)
+        if args.file != "-":
+            print(f"Exported {count} {args.kind} to {args.file}")
+        return
+
+    saver = open_saver(args.state)
+    try:
+        report = import_file(saver, args.kind, args.file, args.format, args.create_tasks)
+    finally:
+        saver.stop()
+    for error in report.errors[:20]:
+        print(error, file=sys.stderr)
+    if len(report.errors) > 20:
+        print(f"... and {len(report.errors) - 20} more", file=sys.stderr)
+    print(f"Imported {report.added} of {report.rows} {args.kind} ({report.skipped} skipped)")
+
+if __name__ == "__main__":
+    main(sys.argv)